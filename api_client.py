@@ -0,0 +1,597 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import pandas as pd
+import pyarrow as pa
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from artifacts import expire_artifacts
+from query_cache import DELTA_KEYS, QueryCache, SingleFlight, content_hash, query_key
+from snapshot_store import SnapshotStore
+from resilience import BackendUnavailable, CircuitBreaker
+from report_fields import COUNTRY_NARRATIVE_FIELDS, COUNTRY_SUMMARY_FIELDS, FUND_SUMMARY_FIELDS, PANEL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Endpoint for the process_json backend. Set PROCESS_JSON_URL to point every page at another server.
+PROCESS_JSON_URL = os.environ.get(
+    "PROCESS_JSON_URL", "https://my-combined-app-vpljqiia2a-uc.a.run.app/process_json"
+)
+
+# Connection settings shared by every backend call
+CONNECT_TIMEOUT = 3.05  # seconds to establish the connection
+READ_TIMEOUT = 30  # seconds to wait for the response body
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5  # sleeps 0.5s, 1s, 2s between retries
+POOL_SIZE = 16
+DEFAULT_PAGE_SIZE = 10
+BATCH_PAGE_SIZE = 500  # rows per page when several entities are fetched in one query
+PREFETCH_WORKERS = 8  # concurrent fetches when warming the cache
+REFRESH_WORKERS = 2  # background refreshes of results served from a snapshot
+
+# Columnar response format offered to the backend for bulk table transfer; JSON stays the fallback
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+COLUMNAR_ACCEPT = f"{ARROW_STREAM}, application/json;q=0.5"
+
+# SQLite file keeping the last good result of each query across restarts; empty disables it
+SNAPSHOT_PATH = os.environ.get("PROCESS_JSON_SNAPSHOTS", "snapshots.db")
+
+
+# Function to build a process_json query. fields is "*" or a list of column names,
+# which is sent as a comma-separated column list.
+def build_query(db_path, table, filters=None, fields="*", page=1, page_size=10):
+    return {
+        "db_path": db_path,
+        "table": table,
+        "filters": filters or {},
+        "fields": fields if isinstance(fields, str) else ", ".join(fields),
+        "page": page,
+        "page_size": page_size,
+    }
+
+
+# The backend expects the query serialized as a JSON string under "sample_key"
+def encode_payload(query):
+    return {"sample_key": json.dumps(query)}
+
+
+# A delta can only be merged into a complete, single-page result whose rows carry the key columns
+def can_apply_delta(query, rows):
+    keys = DELTA_KEYS.get(query.get("table"))
+    if keys is None or query.get("page", 1) != 1:
+        return False
+    if len(rows) >= (query.get("page_size") or DEFAULT_PAGE_SIZE):
+        return False
+    return all(key in row for key in keys for row in rows[:1])
+
+
+# Function to apply changed rows to a cached result by key; rows flagged _deleted are removed
+def merge_delta(rows, changes, keys):
+    merged = {tuple(row.get(key) for key in keys): row for row in rows}
+    for row in changes:
+        row_key = tuple(row.get(key) for key in keys)
+        if row.get("_deleted"):
+            merged.pop(row_key, None)
+        else:
+            merged[row_key] = row
+    return list(merged.values())
+
+
+class ProcessJsonClient:
+    """
+    Pooled HTTP client for the process_json endpoint.
+    Keeps connections alive between calls, retries transient failures with backoff and
+    serves repeated queries from a shared result cache. With a snapshot store, a query
+    missing from the cache is answered from its last good result on disk and refreshed
+    in the background. A circuit breaker stops calls while the backend keeps failing.
+    """
+
+    def __init__(self, url=PROCESS_JSON_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, pool_size=POOL_SIZE,
+                 cache=None, snapshots=None):
+        self.url = url
+        self.timeout = timeout
+        self.cache = cache if cache is not None else QueryCache()
+        self.snapshots = snapshots
+        self._refresher = ThreadPoolExecutor(max_workers=REFRESH_WORKERS)
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._deadline_pool = ThreadPoolExecutor(max_workers=pool_size)
+        # Decoded DataFrame pages of columnar responses, kept apart from the row cache
+        self.frames = QueryCache(table_ttls=self.cache.table_ttls, max_bytes=self.cache.max_bytes)
+        # Caches of results derived from fetched data, keyed by query; dropped with it on invalidate
+        self.derived_caches = []
+        # Cleared once the backend answers a columnar request with JSON
+        self.columnar = True
+        self.breaker = CircuitBreaker()
+
+        # process_json is a read-only query, so retrying the POST is safe
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def post(self, query, timeout=None):
+        """
+        Send a query to process_json and return the decoded rows, bypassing the cache.
+        Raises requests.exceptions.RequestException on network errors or a bad status code.
+        """
+        return self._send(query, timeout).json()
+
+    def fetch_rows(self, query, timeout=None, deadline=None):
+        """
+        Return the rows for a query, from the cache when a fresh result is held.
+        Identical queries missing the cache at the same time share one backend call.
+        Under a deadline, a fetch that fails or is still running when it passes falls back to
+        the last known good result and marks the deadline stale; the fetch carries on in the
+        background to fill the cache for the next run. With no such result, the call waits for
+        the fetch instead. A snapshot served past its table's TTL
+        marks the deadline stale too.
+        The rows are shared with other sessions and must not be mutated.
+        """
+        rows = self.cache.get(query)
+        if rows is not None:
+            return rows
+        if deadline is None:
+            return self._flights.do(query_key(query), self._load, query, timeout)[0]
+
+        future = self._deadline_pool.submit(self._flights.do, query_key(query), self._load, query, timeout)
+        try:
+            rows, stale_as_of = future.result(timeout=deadline.remaining())
+        except (FutureTimeout, requests.exceptions.RequestException) as e:
+            fallback = self.last_known_good(query)
+            if fallback is not None:
+                rows, stale_as_of = fallback
+            elif isinstance(e, FutureTimeout):
+                # The budget only bounds fetches that have something to fall back to
+                rows, stale_as_of = future.result()
+            else:
+                raise
+        if stale_as_of is not None:
+            deadline.mark_stale(stale_as_of)
+        return rows
+
+    def last_known_good(self, query):
+        """Return (rows, fetched_at) of the newest result held for a query, however old, or None."""
+        stale = self.cache.get_stale(query)
+        if stale is not None:
+            return stale[0], stale[1].get("fetched_at", time.time())
+        snapshot = self._load_snapshot(query)
+        if snapshot is not None:
+            return snapshot[0], snapshot[1]
+        return None
+
+    def _load(self, query, timeout=None):
+        """
+        Return (rows, stale_as_of) for a query. stale_as_of is the save time of a snapshot
+        served past its table's TTL, and None for rows that are fresh.
+        """
+        # Another caller may have filled the cache while this one waited to lead the flight
+        rows = self.cache.get(query)
+        if rows is not None:
+            return rows, None
+
+        # An expired result still in memory is revalidated rather than downloaded again
+        stale = self.cache.get_stale(query)
+        if stale is None:
+            snapshot = self._load_snapshot(query)
+            if snapshot is not None:
+                self.refresh_in_background(query)
+                saved_at = snapshot[1]
+                expired = time.time() - saved_at > self.cache.ttl_for(query.get("table"))
+                return snapshot[0], saved_at if expired else None
+
+        return self._revalidate(query, stale, timeout), None
+
+    def _load_snapshot(self, query):
+        # Like saving, reading a snapshot is best effort: an unreadable store counts as a miss
+        if self.snapshots is None:
+            return None
+        try:
+            return self.snapshots.load(query)
+        except sqlite3.Error as e:
+            logger.warning("Could not read snapshot of %s: %s", query.get("table"), e)
+            return None
+
+    def load_snapshots(self):
+        """
+        Warm the cache from the snapshot store at startup. Snapshots still within their
+        table's TTL go straight into the cache; older ones are refreshed in the background.
+        """
+        now = time.time()
+        for query, rows, nbytes, saved_at, meta in self.snapshots.load_all():
+            remaining = self.cache.ttl_for(query.get("table")) - (now - saved_at)
+            if remaining > 0:
+                self.cache.put(query, rows, nbytes, ttl=remaining, meta=meta)
+            else:
+                self.refresh_in_background(query)
+
+    def refresh_in_background(self, query):
+        key = query_key(query)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._refresher.submit(self._refresh, key, query)
+
+    def _refresh(self, key, query):
+        try:
+            # Not coalesced with foreground loads: a load serving this query's snapshot is what
+            # scheduled the refresh, and joining its flight would just return the snapshot
+            self._revalidate_latest(query)
+        except requests.exceptions.RequestException:
+            pass  # keep serving the snapshot until a later refresh succeeds
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+
+    def _revalidate_latest(self, query):
+        stale = self.cache.get_stale(query)
+        if stale is None:
+            snapshot = self._load_snapshot(query)
+            stale = None if snapshot is None else (snapshot[0], snapshot[2])
+        return self._revalidate(query, stale)
+
+    def _revalidate(self, query, stale, timeout=None):
+        """
+        Fetch a query, sending the stale (rows, meta) result's validators when there is one.
+        An unchanged result comes back as an empty 304 and the stale rows are kept. For
+        tables in DELTA_KEYS the last seen data version is sent as "since", and a backend
+        that answers with X-Delta returns only the changed rows, which are merged in.
+        """
+        rows, meta = stale if stale is not None else (None, {})
+        request_query = query
+        if rows is not None and meta.get("version") is not None and can_apply_delta(query, rows):
+            request_query = dict(query, since=meta["version"])
+
+        response = self._send(request_query, timeout, etag=meta.get("etag") if rows is not None else None)
+        if response.status_code == 304 and rows is not None:
+            nbytes = meta.get("nbytes", 0)
+            etag = response.headers.get("ETag") or meta.get("etag")
+        else:
+            changes = response.json()
+            if "since" in request_query and response.headers.get("X-Delta"):
+                rows = merge_delta(rows, changes, DELTA_KEYS[query["table"]])
+                nbytes = len(json.dumps(rows))  # replaced rows no longer count
+                etag = response.headers.get("ETag")
+            else:
+                rows = changes
+                nbytes = len(response.content)
+                etag = response.headers.get("ETag") or content_hash(response.content)
+
+        meta = {
+            "etag": etag,
+            "version": response.headers.get("X-Data-Version", meta.get("version")),
+            "nbytes": nbytes,
+            "fetched_at": time.time(),
+        }
+        self._store(query, rows, nbytes, meta)
+        return rows
+
+    def _store(self, query, rows, nbytes, meta=None):
+        self.cache.put(query, rows, nbytes, meta=meta)
+        if self.snapshots is not None:
+            # The snapshot is a best-effort copy: a locked or full database must not fail a
+            # fetch the backend answered
+            try:
+                self.snapshots.save(query, rows, meta)
+            except sqlite3.Error as e:
+                logger.warning("Could not save snapshot of %s: %s", query.get("table"), e)
+
+    def iter_rows(self, query, max_pages=None, timeout=None, deadline=None):
+        """
+        Yield every row matching a query, walking the pages of process_json in order.
+        The next page is requested in the background while the current one is consumed,
+        and iteration stops at the first page shorter than the query's page_size.
+        """
+        page = query.get("page", 1)
+        page_size = query.get("page_size") or DEFAULT_PAGE_SIZE
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(self.fetch_rows, dict(query, page=page, page_size=page_size), timeout, deadline)
+            pages_read = 0
+            while True:
+                rows = future.result()
+                pages_read += 1
+                last_page = len(rows) < page_size or (max_pages is not None and pages_read >= max_pages)
+                if not last_page:
+                    next_query = dict(query, page=page + 1, page_size=page_size)
+                    future = executor.submit(self.fetch_rows, next_query, timeout, deadline)
+                yield from rows
+                if last_page:
+                    return
+                page += 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_all(self, query, max_pages=None, timeout=None, deadline=None):
+        return list(self.iter_rows(query, max_pages=max_pages, timeout=timeout, deadline=deadline))
+
+    def fetch_batch(self, query, field, values, timeout=None, deadline=None, frames=False):
+        """
+        Fetch the rows for several entities in one query, using a list-valued (IN) filter on
+        field, and split them back out per entity. Returns a dict of value -> rows.
+        Each entity that came back with rows is also stored in the cache under its own
+        single-entity query, so the per-entity fetches that follow are cache hits.
+        With frames, the batch goes through fetch_frame instead, each entity's slice is kept
+        in the frame cache for its own fetch_frame calls, and the dict holds DataFrames.
+        """
+        filters = query.get("filters") or {}
+        entity_queries = {value: dict(query, filters=dict(filters, **{field: value})) for value in values}
+        if frames:
+            return self._fetch_batch_frames(query, field, entity_queries, timeout, deadline)
+
+        # Only entities without a cached first page go into the batch
+        missing = [value for value, entity_query in entity_queries.items() if self.cache.get(entity_query) is None]
+        if len(missing) > 1:
+            batch_query = dict(query, filters=dict(filters, **{field: missing}), page=1, page_size=BATCH_PAGE_SIZE)
+            batched = {value: [] for value in missing}
+            for row in self.iter_rows(batch_query, timeout=timeout, deadline=deadline):
+                rows = batched.get(row.get(field))
+                if rows is not None:
+                    rows.append(row)
+
+            # An entity missing from the batch is left uncached rather than cached as empty,
+            # so a backend that ignores list filters only costs the usual per-entity fetch
+            for value, rows in batched.items():
+                if rows:
+                    self._store_pages(entity_queries[value], rows)
+
+        return {
+            value: self.fetch_all(entity_query, timeout=timeout, deadline=deadline)
+            for value, entity_query in entity_queries.items()
+        }
+
+    def _fetch_batch_frames(self, query, field, entity_queries, timeout=None, deadline=None):
+        page_size = query.get("page_size") or DEFAULT_PAGE_SIZE
+        missing = [
+            value for value, entity_query in entity_queries.items()
+            if self.frames.get(dict(entity_query, page=entity_query.get("page", 1), page_size=page_size)) is None
+        ]
+        if len(missing) > 1:
+            filters = query.get("filters") or {}
+            batch_query = dict(query, filters=dict(filters, **{field: missing}), page=1, page_size=BATCH_PAGE_SIZE)
+            # The batch gets its own scope, so a frame built from last known good rows is not kept
+            batch_deadline = deadline.scope() if deadline is not None else None
+            batch = self.fetch_frame(batch_query, timeout=timeout, deadline=batch_deadline)
+            if field in batch and (batch_deadline is None or batch_deadline.stale_as_of is None):
+                for value, frame in batch.groupby(field, sort=False):
+                    if value in entity_queries:
+                        self._store_frame_pages(entity_queries[value], frame.reset_index(drop=True))
+
+        return {
+            value: self.fetch_frame(entity_query, timeout=timeout, deadline=deadline)
+            for value, entity_query in entity_queries.items()
+        }
+
+    def _store_frame_pages(self, query, frame):
+        # Cache a frame as the pages fetch_frame would request, ending with a short page
+        page_size = query.get("page_size") or DEFAULT_PAGE_SIZE
+        first_page = query.get("page", 1)
+        for offset in range(0, len(frame) + 1, page_size):
+            page_frame = frame.iloc[offset:offset + page_size].reset_index(drop=True)
+            page_query = dict(query, page=first_page + offset // page_size, page_size=page_size)
+            self.frames.put(page_query, page_frame, int(page_frame.memory_usage(deep=True).sum()))
+
+    def _store_pages(self, query, rows):
+        # Cache rows as the pages iter_rows would request, ending with a short page
+        page_size = query.get("page_size") or DEFAULT_PAGE_SIZE
+        first_page = query.get("page", 1)
+        for offset in range(0, len(rows) + 1, page_size):
+            page_rows = rows[offset:offset + page_size]
+            page_query = dict(query, page=first_page + offset // page_size, page_size=page_size)
+            nbytes = len(json.dumps(page_rows))
+            self._store(page_query, page_rows, nbytes, {"nbytes": nbytes, "fetched_at": time.time()})
+
+    def prefetch(self, queries, max_workers=PREFETCH_WORKERS, deadline=None):
+        """
+        Fetch several queries concurrently so later fetch_rows calls are served from the cache.
+        Returns a dict of query key -> exception for the queries that failed; the page then
+        surfaces those errors when it fetches the query again while rendering.
+        """
+        queries = list(queries)
+        if not queries:
+            return {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            futures = {query_key(query): executor.submit(self.fetch_rows, query, None, deadline) for query in queries}
+            for key, future in futures.items():
+                try:
+                    future.result()
+                except requests.exceptions.RequestException as e:
+                    errors[key] = e
+        return errors
+
+    def fetch_frame(self, query, timeout=None, deadline=None):
+        """
+        Return every row of a query as a DataFrame. Pages are requested as Arrow IPC streams
+        and decoded column-wise straight into pandas, with no per-row dicts in between. Pages
+        already held as rows, a backend that answers in JSON, and any failure or missed
+        deadline all go through the row pipeline instead, with its snapshot and last known
+        good fallbacks. The returned frame may be shared and must not be mutated.
+        """
+        page = query.get("page", 1)
+        page_size = query.get("page_size") or DEFAULT_PAGE_SIZE
+        frames = []
+        while True:
+            page_query = dict(query, page=page, page_size=page_size)
+            frame = self._fetch_page_frame(page_query, timeout, deadline)
+            if frame is None:
+                return pd.DataFrame(self.fetch_all(query, timeout=timeout, deadline=deadline))
+            frames.append(frame)
+            if len(frame) < page_size:
+                break
+            page += 1
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def _fetch_page_frame(self, query, timeout=None, deadline=None):
+        # Returns None when the page should come from the row pipeline
+        frame = self.frames.get(query)
+        if frame is not None:
+            return frame
+        if not self.columnar or self.cache.get_stale(query) is not None:
+            return None
+
+        future = self._deadline_pool.submit(
+            self._flights.do, "frame:" + query_key(query), self._load_frame, query, timeout
+        )
+        try:
+            return future.result(timeout=deadline.remaining() if deadline is not None else None)
+        except FutureTimeout:
+            # The budget only bounds fetches that have something to fall back to
+            if self.last_known_good(query) is not None:
+                return None
+        except requests.exceptions.RequestException:
+            return None
+        try:
+            return future.result()
+        except requests.exceptions.RequestException:
+            return None
+
+    def _load_frame(self, query, timeout=None):
+        response = self._send(query, timeout, accept=COLUMNAR_ACCEPT)
+        if response.headers.get("Content-Type", "").startswith(ARROW_STREAM):
+            frame = pa.ipc.open_stream(response.content).read_pandas()
+            self.frames.put(query, frame, len(response.content))
+            return frame
+
+        # The backend only speaks JSON: keep its rows and stop asking for Arrow
+        self.columnar = False
+        rows = response.json()
+        nbytes = len(response.content)
+        self._store(query, rows, nbytes, {
+            "etag": response.headers.get("ETag") or content_hash(response.content),
+            "nbytes": nbytes,
+            "fetched_at": time.time(),
+        })
+        return pd.DataFrame(rows)
+
+    def invalidate(self, table=None, query=None):
+        """
+        Drop held results, as QueryCache.invalidate does, from memory, from the snapshot
+        store and from every derived cache, so the next fetch goes to the backend. The
+        pre-rendered artifacts of the table are expired too; a single query expires its
+        table's artifacts.
+        """
+        expire_artifacts(query.get("table") if query is not None else table)
+        self.cache.invalidate(table=table, query=query)
+        self.frames.invalidate(table=table, query=query)
+        for cache in self.derived_caches:
+            cache.invalidate(table=table, query=query)
+        if self.snapshots is not None:
+            self.snapshots.delete(table=table, query=query)
+
+    def _send(self, query, timeout=None, etag=None, accept=None):
+        if not self.breaker.allow():
+            raise BackendUnavailable("process_json is failing; calls are paused")
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if accept:
+            headers["Accept"] = accept
+        try:
+            response = self.session.post(self.url, json=encode_payload(query), headers=headers or None,
+                                         timeout=timeout or self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            # A rejected query (4xx other than 429) still means the backend is up
+            if e.response.status_code >= 500 or e.response.status_code == 429:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except requests.exceptions.RequestException:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return response
+
+
+# One client per process, shared by every session and rerun
+@st.cache_resource
+def get_client():
+    if not SNAPSHOT_PATH:
+        return ProcessJsonClient()
+    client = ProcessJsonClient(snapshots=SnapshotStore(SNAPSHOT_PATH))
+    client.load_snapshots()
+    return client
+
+
+# Query for a country's FullReport row
+def country_report_query(country, db_path="credit_research.db", table="FullReport", page=1, page_size=10,
+                         fields="*"):
+    return build_query(db_path, table, {"Country": country}, fields, page=page, page_size=page_size)
+
+
+# Query for every country's FullReport row, in pages large enough that one request usually covers them all
+def all_reports_query(db_path="credit_research.db", table="FullReport", fields=PANEL_FIELDS):
+    return build_query(db_path, table, None, fields, page=1, page_size=BATCH_PAGE_SIZE)
+
+
+# Query for a fund's holdings
+def fund_holdings_query(fund_name, page=1, page_size=100, fields="*"):
+    return build_query("consolidated.db", "fund_holdings", {"fund_name": fund_name}, fields,
+                       page=page, page_size=page_size)
+
+
+# Function to fetch a country's report row. The summary and the wide narrative columns are
+# separate projections, fetched concurrently so a cold report costs one round trip of latency.
+def fetch_country_report(country, db_path="credit_research.db", table="FullReport", client=None, deadline=None):
+    client = client or get_client()
+    summary_query = country_report_query(country, db_path, table, fields=COUNTRY_SUMMARY_FIELDS)
+    narrative_query = country_report_query(country, db_path, table, fields=COUNTRY_NARRATIVE_FIELDS)
+    client.prefetch([summary_query, narrative_query], deadline=deadline)
+
+    report = next(client.iter_rows(summary_query, deadline=deadline), None)
+    if report:
+        report = dict(report, **(next(client.iter_rows(narrative_query, deadline=deadline), None) or {}))
+    return report
+
+
+# Function to load country reports and fund holdings with one batched query per table, plus
+# the bulk query behind the economic panel when countries are loaded.
+# Failures are returned rather than raised; the per-entity fetches surface them when rendering.
+def warm_reports(countries=(), fund_names=(), client=None, deadline=None):
+    client = client or get_client()
+    # The entity filter in each template query is replaced by the batch's list filter
+    # Country reports are read as rows; fund holdings are read as frames, so they come as Arrow
+    batches = [
+        (country_report_query(None, fields=COUNTRY_SUMMARY_FIELDS), "Country", list(countries), False),
+        (country_report_query(None, fields=COUNTRY_NARRATIVE_FIELDS), "Country", list(countries), False),
+        (fund_holdings_query(None, fields=FUND_SUMMARY_FIELDS), "fund_name", list(fund_names), True),
+    ]
+    batches = [batch for batch in batches if batch[2]]
+    errors = []
+    if not batches:
+        return errors
+    with ThreadPoolExecutor(max_workers=len(batches) + 1) as executor:
+        futures = [
+            executor.submit(client.fetch_batch, query, field, values, deadline=deadline, frames=frames)
+            for query, field, values, frames in batches
+        ]
+        # Country tabs slice their economic series from the panel of every country
+        if countries:
+            futures.append(executor.submit(client.fetch_frame, all_reports_query(), deadline=deadline))
+        for future in futures:
+            try:
+                future.result()
+            except requests.exceptions.RequestException as e:
+                errors.append(e)
+    return errors
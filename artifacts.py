@@ -0,0 +1,114 @@
+import json
+import os
+import re
+import threading
+import time
+
+import pyarrow.feather as feather
+from plotly.utils import PlotlyJSONEncoder
+
+from query_cache import TABLE_TTLS
+
+# Directory prerender.py writes report artifacts to, and the pages read them from
+ARTIFACT_DIR = os.environ.get("REPORT_ARTIFACTS", "artifacts")
+
+# Bumped when the artifact layout changes; artifacts of another version are ignored
+ARTIFACT_VERSION = 2
+
+# Table each kind of artifact is built from
+ARTIFACT_TABLES = {
+    "country": "FullReport",
+    "fund": "fund_holdings",
+}
+
+# An artifact is served while it is younger than the cache TTL of the table it was built from
+ARTIFACT_MAX_AGE = {kind: TABLE_TTLS[table] for kind, table in ARTIFACT_TABLES.items()}
+
+
+# Function to build the path of an entity's artifact file
+def artifact_path(kind, name, suffix=".json", directory=None):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")
+    return os.path.join(directory or ARTIFACT_DIR, kind, slug + suffix)
+
+
+# Function to write a file atomically, so a page never reads a half-written artifact
+def _replace(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def save_artifact(kind, name, artifact, frame=None, directory=None):
+    """
+    Write an entity's rendered artifact: JSON holding its HTML fragments and figure dicts,
+    plus, for funds, the holdings frame as a Feather file. The frame is written first, so a
+    fresh JSON file always has its frame beside it.
+    """
+    path = artifact_path(kind, name, directory=directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if frame is not None:
+        _replace(artifact_path(kind, name, ".arrow", directory), lambda tmp: feather.write_feather(frame, tmp))
+
+    def write_json(tmp):
+        with open(tmp, "w") as f:
+            # Figure dicts hold numpy arrays, which Plotly's encoder writes as lists
+            json.dump(dict(artifact, kind=kind, name=name, version=ARTIFACT_VERSION, rendered_at=time.time()),
+                      f, cls=PlotlyJSONEncoder)
+
+    _replace(path, write_json)
+    return path
+
+
+_loaded = {}  # path -> (mtime_ns, artifact, frame)
+_expired_at = {}  # kind -> time its table was last invalidated
+_loaded_lock = threading.Lock()
+
+
+# Function to expire the artifacts built from a table, or from every table if table is None.
+# Artifacts written before this are no longer served; newer ones from prerender.py are.
+def expire_artifacts(table=None):
+    now = time.time()
+    with _loaded_lock:
+        for kind, kind_table in ARTIFACT_TABLES.items():
+            if table is None or table == kind_table:
+                _expired_at[kind] = now
+
+
+def load_artifact(kind, name):
+    """
+    Return (artifact, frame) for an entity's artifact if one exists and is fresh, else None.
+    An artifact written before its table was last invalidated is not fresh.
+    frame is None for artifacts saved without one. Files are parsed once per modification,
+    so repeat page views share the same objects, which must not be mutated.
+    """
+    path = artifact_path(kind, name)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    if time.time() - mtime_ns / 1e9 > ARTIFACT_MAX_AGE.get(kind, 0):
+        return None
+    if mtime_ns / 1e9 <= _expired_at.get(kind, 0):
+        return None
+
+    with _loaded_lock:
+        loaded = _loaded.get(path)
+    if loaded is not None and loaded[0] == mtime_ns:
+        return loaded[1], loaded[2]
+
+    try:
+        with open(path) as f:
+            artifact = json.load(f)
+        frame_path = artifact_path(kind, name, ".arrow")
+        frame = feather.read_table(frame_path).to_pandas() if os.path.exists(frame_path) else None
+    except (OSError, ValueError):
+        return None
+    if artifact.get("version") != ARTIFACT_VERSION:
+        return None
+    with _loaded_lock:
+        _loaded[path] = (mtime_ns, artifact, frame)
+    return artifact, frame
@@ -0,0 +1,81 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from frame_cache import FrameCache
+from report_fields import COUNTRY_RATINGS
+
+# Screen results remembered per screener, so rerunning an unchanged query returns the same frame
+RESULTS_PER_SCREENER = 64
+
+
+class CountryScreener:
+    """
+    Ranks and filters every country of an EconomicPanel by an economic indicator in a given
+    year and by rating floors. A query is a slice of one metric and year, a few vectorized
+    comparisons and one argsort.
+    """
+
+    def __init__(self, panel):
+        # Held weakly, so the registry below does not keep the panel alive
+        self._panel = weakref.ref(panel)
+        self.countries = np.array(panel.countries, dtype=object)
+        self.ratings = {field: panel.rating(field) for field, _ in COUNTRY_RATINGS}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def panel(self):
+        return self._panel()
+
+    def __len__(self):
+        return len(self.countries)
+
+    def screen(self, metric, year, min_value=None, max_value=None, min_ratings=(), descending=True):
+        """
+        Return the countries with a value for metric in year, within [min_value, max_value]
+        and rated at least each (rating field, floor) in min_ratings, ranked by that value.
+        Countries missing a screened value or rating are left out.
+        """
+        key = (metric, year, min_value, max_value, tuple(min_ratings), descending)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+
+        values = self.panel.cross_section(metric, year)
+        mask = ~np.isnan(values)
+        if min_value is not None:
+            mask &= values >= min_value
+        if max_value is not None:
+            mask &= values <= max_value
+        for field, floor in min_ratings:
+            mask &= self.ratings[field] >= floor  # False for a missing rating
+
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(-values[rows] if descending else values[rows], kind="stable")]
+        result = pd.DataFrame({
+            "Rank": np.arange(1, len(rows) + 1),
+            "Country": self.countries[rows],
+            f"{self.panel.metric_label(metric)} {year}": values[rows],
+            **{label: self.ratings[field][rows] for field, label in COUNTRY_RATINGS},
+        })
+
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > RESULTS_PER_SCREENER:
+                self._results.popitem(last=False)
+        return result
+
+
+_screeners = FrameCache(CountryScreener)
+
+
+# Function to get the screener of a panel, built on first use and kept as long as the panel,
+# so its remembered results are shared by every session screening it
+def country_screener(panel):
+    return _screeners.get(panel)
@@ -1,7 +1,11 @@
 import streamlit as st
-import plotly.express as px
 import pandas as pd
 import requests
+from api_client import fetch_country_report
+from report_utils import (stale_badge, plot_indicator_chart, create_economic_table, country_narrative, country_artifact,
+                          show_country_artifact, fetch_economic_panel)
+from artifacts import load_artifact
+from report_fields import ECONOMIC_FIRST_YEAR
 
 # Main function to encapsulate the app logic
 def main():
@@ -86,117 +90,32 @@ def main():
 
 # Function to fetch data from your API
 def fetch_data_for_country(country):
-    url = "https://my-combined-app-vpljqiia2a-uc.a.run.app/process_json"
-    payload = {
-        "sample_key": f'{{"db_path": "credit_research.db", "table": "FullReport", "filters": {{"Country": "{country}"}}, "fields": "*", "page": 1, "page_size": 10}}'
-    }
-
-    all_data = []
-    for page in range(1, 3):
-        response = requests.post(url, json=payload)
-        if response.status_code == 200:
-            all_data.extend(response.json())
-        else:
-            st.error(f"Failed to retrieve data for {country} (page {page})")
-            return None
-    
-    if all_data:
-        return all_data[0]
-    else:
+    try:
+        return fetch_country_report(country)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to retrieve data for {country}: {e}")
         return None
 
-# Function to plot charts
-def plot_chart(df, y_column, title, color):
-    y_min = df[y_column].min()
-    y_max = df[y_column].max()
-
-    if y_min == y_max:
-        y_range = [y_min - 1, y_max + 1]
-    else:
-        y_range = [y_min - 0.05 * abs(y_min), y_max + 0.05 * abs(y_max)]
-
-    fig = px.bar(df, x='Year', y=y_column,
-                 title=title,
-                 color_discrete_sequence=[color],
-                 height=375)
-    fig.update_traces(marker_line_width=0)
-    fig.update_layout(
-        yaxis=dict(range=y_range),
-        plot_bgcolor='#2f2f2f',
-        paper_bgcolor='#2f2f2f',
-        font=dict(color='white'),
-        margin=dict(l=20, r=20, t=60, b=40),
-        autosize=True
-    )
-    return fig
-
-# Function to create data tables
-def create_data_table(df, y_column):
-    table_html = "<table class='data-table'>"
-    table_html += "<tr><th>Year</th>" + "".join([f"<th>{year}</th>" for year in df['Year']]) + "</tr>"
-    table_html += f"<tr><td>{y_column}</td>"
-    for value in df[y_column]:
-        if value is not None:
-            table_html += f"<td>{value:.2f}</td>"  # Format as a float with 2 decimal places
-        else:
-            table_html += "<td>N/A</td>"  # Use "N/A" for None values
-    table_html += "</tr></table>"
-    return table_html
-
 # Function to display the report and charts
 def display_report_for_country(country, color_palette):
     report = fetch_data_for_country(country)
+    panel = fetch_economic_panel() if report else None
 
     if report:
         col1, col2 = st.columns([6, 4])
 
         with col1:
-            st.markdown('<div class="reportColumn">', unsafe_allow_html=True)
-            st.markdown(f'<h1 class="reportText">{report.get("Title", "Credit Research Report")}</h1>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Country Information</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText"><strong>Country:</strong> {report.get("Country", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText"><strong>Ownership:</strong> {report.get("Ownership", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText"><strong>NFA Rating:</strong> {report.get("NFARating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText"><strong>ESG Rating:</strong> {report.get("ESGRating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Overview</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Overview", "No overview available.")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Politics</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("PoliticalNews", "No political news available.")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Strengths</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Strengths", "No strengths information available.")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Weaknesses</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Weaknesses", "No weaknesses information available.")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Opportunities</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Opportunities", "No opportunities information available.")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Threats</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Threats", "No threats information available.")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Recent News</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("RecentNews", "No recent news available.")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Ratings and Comments from Credit Rating Agencies</h2>', unsafe_allow_html=True)
-            st.markdown('<h3 class="reportText">Moody\'s:</h3>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("MoodysRating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown('<h3 class="reportText">S&P Global Ratings:</h3>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("SPGlobalRating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown('<h3 class="reportText">Fitch Ratings:</h3>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("FitchRating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown('<h2 class="reportText">Conclusion</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Conclusion", "No conclusion available.")}</p>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            st.markdown(country_narrative(report), unsafe_allow_html=True)
 
         with col2:
             st.markdown('<div class="chartColumn">', unsafe_allow_html=True)
-            st.header("Economic Data (2024 Onwards)")
-
-            charts_data = [
-                ("GDP Growth (%)", [report.get(f'GDPGrowthRateYear{i}', 0) for i in range(1, 7)], color_palette[0]),
-                ("Inflation Rate (%)", [report.get(f'InflationYear{i}', 0) for i in range(1, 7)], color_palette[1]),
-                ("Unemployment Rate (%)", [report.get(f'UnemploymentRateYear{i}', 0) for i in range(1, 7)], color_palette[2]),
-                ("Population (millions)", [report.get(f'PopulationYear{i}', 0) for i in range(1, 7)], color_palette[3]),
-                ("Government Budget Balance (% of GDP)", [report.get(f'GovernmentFinancesYear{i}', 0) for i in range(1, 7)], color_palette[4]),
-                ("Current Account Balance (% of GDP)", [report.get(f'CurrentAccountBalanceYear{i}', 0) for i in range(1, 7)], color_palette[5])
-            ]
+            st.header(f"Economic Data ({ECONOMIC_FIRST_YEAR} Onwards)")
+            if panel is None:
+                st.markdown('</div>', unsafe_allow_html=True)
+                return
 
-            years = [2024, 2025, 2026, 2027, 2028, 2029]
+            charts_data = panel.charts_data(country, color_palette)
+            years = panel.years
 
             for metric, values, color in charts_data:
                 df = pd.DataFrame({
@@ -205,10 +124,11 @@ def display_report_for_country(country, color_palette):
                 })
 
                 # Display the chart with the specified color
-                st.plotly_chart(plot_chart(df, metric, metric, color), use_container_width=True)
+                st.plotly_chart(plot_indicator_chart(df, metric, metric, color, bg_color='#2f2f2f'),
+                                use_container_width=True)
 
-                # Display the data table
-                st.markdown(create_data_table(df, metric), unsafe_allow_html=True)
+            # Display the data table for every metric at once
+            st.markdown(create_economic_table(charts_data, years), unsafe_allow_html=True)
 
             st.markdown('</div>', unsafe_allow_html=True)
     else:
@@ -222,138 +142,36 @@ if __name__ == "__main__":
 
 
 
-def create_country_report_tab(country, color_palette):
+def create_country_report_tab(country, color_palette, deadline=None, compact=False):
     """
     Function to create a country report tab.
     :param country: Name of the country for which the report is generated.
     :param color_palette: List of colors for chart generation.
+    :param deadline: Optional page Deadline; past it the report renders from the last known good data.
+    :param compact: Draw the economic indicators as one grid figure instead of one chart each.
     """
+    report_deadline = deadline.scope() if deadline is not None else None
 
     def fetch_data_for_country(country):
-        url = "https://my-combined-app-vpljqiia2a-uc.a.run.app/process_json"
-        payload = {
-            "sample_key": f'{{"db_path": "credit_research.db", "table": "FullReport", "filters": {{"Country": "{country}"}}, "fields": "*", "page": 1, "page_size": 10}}'
-        }
-
-        all_data = []
-        for page in range(1, 3):
-            response = requests.post(url, json=payload)
-            if response.status_code == 200:
-                all_data.extend(response.json())
-            else:
-                st.error(f"Failed to retrieve data for {country} (page {page})")
-                return None
-
-        if all_data:
-            return all_data[0]
-        else:
+        try:
+            return fetch_country_report(country, deadline=report_deadline)
+        except requests.exceptions.RequestException as e:
+            st.error(f"Failed to retrieve data for {country}: {e}")
             return None
 
-    def plot_chart(df, y_column, title, color):
-        y_min = df[y_column].min()
-        y_max = df[y_column].max()
-
-        if y_min == y_max:
-            y_range = [y_min - 1, y_max + 1]
-        else:
-            y_range = [y_min - 0.05 * abs(y_min), y_max + 0.05 * abs(y_max)]
-
-        fig = px.bar(df, x='Year', y=y_column,
-                     title=title,
-                     color_discrete_sequence=[color],
-                     height=375)
-        fig.update_traces(marker_line_width=0)
-        fig.update_layout(
-            yaxis=dict(range=y_range),
-            plot_bgcolor='#1f1f1f',
-            paper_bgcolor='#1f1f1f',
-            font=dict(color='white'),
-            margin=dict(l=20, r=20, t=60, b=40),
-            autosize=True
-        )
-        return fig
-
-    def create_data_table(df, y_column):
-    # Define the desired width for the Year column
-        year_column_width = "350px"  # Adjust this value as needed
-
-        table_html = "<table class='data-table'>"
-        # Apply the width to the Year column header
-        table_html += f"<tr><th style='width:{year_column_width};'>Year</th>" + "".join([f"<th>{year}</th>" for year in df['Year']]) + "</tr>"
-        # Apply the width to each Year column cell
-        table_html += f"<tr><td style='width:{year_column_width};'>{y_column}</td>"
-        for value in df[y_column]:
-            if value is not None:
-                table_html += f"<td>{value:.2f}</td>"  # Format as a float with 2 decimal places
-            else:
-                table_html += "<td>N/A</td>"  # Use "N/A" for None values
-        table_html += "</tr></table>"
-        return table_html
+    # A fresh pre-rendered artifact is served as is, with no fetch or chart building
+    loaded = load_artifact("country", country)
+    if loaded is not None:
+        show_country_artifact(loaded[0], compact)
+        return
 
     # Fetch and display the report
     report = fetch_data_for_country(country)
+    panel = fetch_economic_panel(deadline=report_deadline) if report else None
+    stale_badge(report_deadline)
 
     if report:
-        col1, col2 = st.columns([6, 4])
-
-        with col1:
-            st.markdown('<div class="reportColumn">', unsafe_allow_html=True)
-            st.markdown(f'<h1 class="reportText">{report.get("Title", "Credit Research Report")}</h1>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Country Information</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText"><strong>Country:</strong> {report.get("Country", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText"><strong>Ownership:</strong> {report.get("Ownership", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText"><strong>NFA Rating:</strong> {report.get("NFARating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText"><strong>ESG Rating:</strong> {report.get("ESGRating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Overview</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Overview", "No overview available.")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Politics</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("PoliticalNews", "No political news available.")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Strengths</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Strengths", "No strengths information available.")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Weaknesses</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Weaknesses", "No weaknesses information available.")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Opportunities</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Opportunities", "No opportunities information available.")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Threats</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Threats", "No threats information available.")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Recent News</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("RecentNews", "No recent news available.")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Ratings and Comments from Credit Rating Agencies</h2>', unsafe_allow_html=True)
-            st.markdown(f'<h3 class="reportText">Moody\'s:</h3>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("MoodysRating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h3 class="reportText">S&P Global Ratings:</h3>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("SPGlobalRating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h3 class="reportText">Fitch Ratings:</h3>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("FitchRating", "N/A")}</p>', unsafe_allow_html=True)
-            st.markdown(f'<h2 class="reportText">Conclusion</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p class="reportText">{report.get("Conclusion", "No conclusion available.")}</p>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-
-        with col2:
-            st.markdown('<div class="chartColumn">', unsafe_allow_html=True)
-            st.header("Economic Data (2024 Onwards)")
-
-            charts_data = [
-                ("GDP Growth (%)", [report.get(f'GDPGrowthRateYear{i}', 0) for i in range(1, 7)], color_palette[0]),
-                ("Inflation Rate (%)", [report.get(f'InflationYear{i}', 0) for i in range(1, 7)], color_palette[1]),
-                ("Unemployment Rate (%)", [report.get(f'UnemploymentRateYear{i}', 0) for i in range(1, 7)], color_palette[2]),
-                ("Population (millions)", [report.get(f'PopulationYear{i}', 0) for i in range(1, 7)], color_palette[3]),
-                ("Government Budget Balance (% of GDP)", [report.get(f'GovernmentFinancesYear{i}', 0) for i in range(1, 7)], color_palette[4]),
-                ("Current Account Balance (% of GDP)", [report.get(f'CurrentAccountBalanceYear{i}', 0) for i in range(1, 7)], color_palette[5])
-            ]
-
-            years = [2024, 2025, 2026, 2027, 2028, 2029]
-
-            for metric, values, color in charts_data:
-                df = pd.DataFrame({
-                    "Year": years,
-                    metric: values
-                })
-
-                st.plotly_chart(plot_chart(df, metric, metric, color), use_container_width=True)
-                st.markdown(create_data_table(df, metric), unsafe_allow_html=True)
-
-            st.markdown('</div>', unsafe_allow_html=True)
+        show_country_artifact(country_artifact(report, panel, color_palette, compact), compact)
     else:
         st.error(f"No report found for {country}.")
 
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from report_fields import COUNTRY_RATINGS, ECONOMIC_METRICS, ECONOMIC_YEARS, ECONOMIC_YEAR_LABELS
+
+
+class EconomicPanel:
+    """
+    Economic series of many countries as one float array indexed [country, metric, year],
+    with NaN where a value is missing, plus each country's numeric ratings. Built in one pass
+    from the bulk FullReport fetch and driven by the ECONOMIC_METRICS catalog, so every
+    country tab, table and cross-country comparison slices it.
+    """
+
+    def __init__(self, countries, values, ratings=None, metrics=ECONOMIC_METRICS, years=ECONOMIC_YEAR_LABELS):
+        self.countries = list(countries)
+        self.metrics = list(metrics)
+        self.years = list(years)
+        self.values = values
+        self.ratings = ratings or {}  # rating field -> float array by country
+        self._country_index = {country: i for i, country in enumerate(self.countries)}
+        self._metric_index = {prefix: i for i, (prefix, _) in enumerate(self.metrics)}
+
+    @classmethod
+    def from_frame(cls, frame, metrics=ECONOMIC_METRICS, years=ECONOMIC_YEARS):
+        """
+        Build a panel from a frame of FullReport rows; columns it lacks are all NaN. A country
+        with several rows keeps the first, the one its report is rendered from.
+        """
+        frame = frame.drop_duplicates("Country") if "Country" in frame else frame
+        columns = [f"{prefix}Year{i}" for prefix, _ in metrics for i in range(1, years + 1)]
+        rating_fields = [field for field, _ in COUNTRY_RATINGS]
+        frame = frame.reindex(columns=["Country"] + rating_fields + columns)
+        values = frame[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        ratings = {field: pd.to_numeric(frame[field], errors="coerce").to_numpy(dtype=float) for field in rating_fields}
+        return cls(frame["Country"], values.reshape(len(frame), len(metrics), years), ratings, metrics,
+                   ECONOMIC_YEAR_LABELS[:years])
+
+    def __len__(self):
+        return len(self.countries)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + sum(ratings.nbytes for ratings in self.ratings.values())
+
+    def metric_label(self, prefix):
+        return self.metrics[self._metric_index[prefix]][1]
+
+    def country(self, country):
+        """[metric, year] block of one country, all NaN for a country the panel lacks."""
+        index = self._country_index.get(country)
+        if index is None:
+            return np.full(self.values.shape[1:], np.nan)
+        return self.values[index]
+
+    def series(self, country, prefix):
+        """One country's values of one metric, by year."""
+        return self.values[self._country_index[country], self._metric_index[prefix]]
+
+    def cross_section(self, prefix, year):
+        """Every country's value of one metric in one calendar year."""
+        return self.values[:, self._metric_index[prefix], self.years.index(year)]
+
+    def rating(self, field):
+        """Every country's numeric rating, NaN where it is missing or not a number."""
+        return self.ratings.get(field, np.full(len(self.countries), np.nan))
+
+    def charts_data(self, country, color_palette):
+        """(label, values, color) entries of one country, as the chart and table builders take."""
+        block = self.country(country)
+        return [
+            (label, block[i].tolist(), color_palette[i % len(color_palette)])
+            for i, (_, label) in enumerate(self.metrics)
+        ]
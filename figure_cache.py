@@ -0,0 +1,61 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+# Most figures kept in memory before the least recently used are evicted
+MAX_FIGURES = 512
+
+
+# Function to build a cache key from a chart's input data and spec.
+# DataFrames and Series are hashed by content; everything else must be JSON serializable.
+def figure_key(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(part, index=False).values.tobytes())
+            digest.update(json.dumps(list(part.columns) if isinstance(part, pd.DataFrame) else part.name,
+                                     default=str).encode())
+        else:
+            digest.update(json.dumps(part, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Bounded LRU cache of serialized Plotly figures, shared by every session.
+    Figures are stored as plain dicts, which st.plotly_chart accepts directly, so a hit skips
+    Plotly Express entirely. Cached dicts are shared and must not be mutated.
+    """
+
+    def __init__(self, max_figures=MAX_FIGURES):
+        self.max_figures = max_figures
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            figure = self._figures.get(key)
+            if figure is not None:
+                self._figures.move_to_end(key)
+                return figure
+
+        figure = build().to_dict()
+        with self._lock:
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_figures:
+                self._figures.popitem(last=False)
+        return figure
+
+    def __len__(self):
+        return len(self._figures)
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
@@ -0,0 +1,158 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from frame_cache import FrameCache
+
+# Masks remembered per column, so a rerun in which one filter changed recomputes only that mask
+MASKS_PER_COLUMN = 16
+
+# Filtered frames remembered per dataset, so an unchanged selection returns the same frame
+RESULTS_PER_INDEX = 4
+
+
+class CategoryIndex:
+    """
+    Row index for a filter over a column's string labels. Each row holds the code of its
+    label in the sorted option list, or an extra never-selected code if missing, so a selection becomes one lookup
+    table gathered over the codes instead of a string comparison per row.
+    """
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values)
+        labels = pd.Index(uniques).astype(str)
+        # Distinct values with the same label (e.g. 1 and "1") share an option
+        self.options = sorted(set(labels))
+        self.positions = {label: code for code, label in enumerate(self.options)}
+        label_codes = np.array([self.positions[label] for label in labels], dtype=np.int64)
+        self.codes = np.full(len(codes), len(self.options), dtype=np.int64)
+        present = codes >= 0
+        self.codes[present] = label_codes[codes[present]]
+
+    def mask(self, selected):
+        lookup = np.zeros(len(self.options) + 1, dtype=bool)
+        lookup[[self.positions[label] for label in selected if label in self.positions]] = True
+        return lookup[self.codes]
+
+
+class NumericIndex:
+    """
+    Row index for a range filter over a numeric column: the values sorted once, so a range
+    is two binary searches and a scatter of the matching row numbers.
+    """
+
+    def __init__(self, values):
+        values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+        self.order = np.argsort(values, kind="stable")  # NaN sorts last
+        self.sorted = values[self.order][: int(np.count_nonzero(~np.isnan(values)))]
+        self.rows = len(values)
+
+    @property
+    def bounds(self):
+        if not len(self.sorted):
+            return None
+        return float(self.sorted[0]), float(self.sorted[-1])
+
+    def mask(self, selected):
+        low, high = selected
+        start = np.searchsorted(self.sorted, low, side="left")
+        stop = np.searchsorted(self.sorted, high, side="right")
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[self.order[start:stop]] = True
+        return mask
+
+
+class FilterIndex:
+    """
+    Per-dataset filter indexes, built once per column on first use and shared by every
+    session filtering the same frame. The mask of each column's recent selections is kept,
+    so changing one filter recomputes only that column's mask before the masks are combined.
+    """
+
+    def __init__(self, df):
+        # Held weakly, so the registry below does not keep the frame alive
+        self._df = weakref.ref(df)
+        self._columns = {}
+        self._masks = {}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def df(self):
+        return self._df()
+
+    def is_numeric(self, column):
+        return pd.api.types.is_numeric_dtype(self.df[column])
+
+    def column(self, column):
+        with self._lock:
+            index = self._columns.get(column)
+            if index is None:
+                values = self.df[column]
+                index = NumericIndex(values) if self.is_numeric(column) else CategoryIndex(values)
+                self._columns[column] = index
+            return index
+
+    def options(self, column):
+        """Sorted string labels of a categorical column, for a multiselect."""
+        return self.column(column).options
+
+    def bounds(self, column):
+        """(min, max) of a numeric column's non-missing values, for a range slider, or None."""
+        return self.column(column).bounds
+
+    def mask(self, column, selected):
+        index = self.column(column)
+        key = tuple(selected)
+        with self._lock:
+            masks = self._masks.setdefault(column, OrderedDict())
+            mask = masks.get(key)
+            if mask is not None:
+                masks.move_to_end(key)
+                return mask
+        mask = index.mask(selected)
+        with self._lock:
+            masks[key] = mask
+            while len(masks) > MASKS_PER_COLUMN:
+                masks.popitem(last=False)
+        return mask
+
+    def apply(self, selections):
+        """
+        Return the rows matching every column's selection, given as {column: selection}.
+        Repeating a recent selection returns the same frame object, so anything cached
+        against the result, such as its table view, is reused.
+        """
+        key = tuple((column, tuple(selected)) for column, selected in selections.items())
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+
+        combined = None
+        for column, selected in selections.items():
+            mask = self.mask(column, selected)
+            combined = mask if combined is None else combined & mask
+        if combined is None or combined.all():
+            return self.df
+        result = self.df[combined]
+
+        # The unfiltered frame is not stored, as that would keep it alive through its own index
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > RESULTS_PER_INDEX:
+                self._results.popitem(last=False)
+        return result
+
+
+_indexes = FrameCache(FilterIndex)
+
+
+# Function to get the FilterIndex of a frame, building it on first use. Indexes are held
+# only as long as their frame, so the frame must not be mutated once it is filtered.
+def filter_index(df):
+    return _indexes.get(df)
@@ -0,0 +1,34 @@
+import threading
+import weakref
+
+
+class FrameCache:
+    """
+    Objects built from a frame (or another weakly referenceable object, such as a panel), keyed
+    by its identity and held only as long as it is alive. build(df) runs once per frame, so the
+    frame must not be mutated once used.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self._entries = {}  # id(df) -> (weakref to df, built object)
+        # Reentrant, as a frame collected while the lock is held runs _discard on the same thread
+        self._lock = threading.RLock()
+
+    def get(self, df):
+        key = id(df)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is df:
+                return entry[1]
+            value = self.build(df)
+            self._entries[key] = (weakref.ref(df, lambda ref, key=key: self._discard(key, ref)), value)
+            return value
+
+    def _discard(self, key, ref):
+        with self._lock:
+            if key in self._entries and self._entries[key][0] is ref:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+# Label for holdings without a rating, which are the fund's cash positions
+CASH = "Cash"
+
+RATING_COLUMNS = ["nfa_star_rating", "esg_country_star_rating"]
+
+# ESG rating at or above which a holding counts towards the "ESG >= 6" share
+ESG_THRESHOLD = 6
+
+
+# Function to encode a rating column as a categorical: ratings in ascending order, then CASH
+# for missing or non-numeric values. Numbers are formatted once per distinct rating, not per row.
+def rating_categorical(values):
+    numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    ratings = np.unique(numeric[~np.isnan(numeric)])
+    codes = np.searchsorted(ratings, numeric)
+    codes[np.isnan(numeric)] = len(ratings)
+    categories = [f"{rating:g}" for rating in ratings] + [CASH]
+    return pd.Categorical.from_codes(codes, categories), numeric
+
+
+def normalize_holdings(data):
+    """
+    Build the normalized holdings frame the fund report renders from: ratings as categoricals
+    with CASH for unrated lines, weighting as float, and the esg_6_or_more flag derived
+    column-wise. The input is not modified. The result is shared through the caches across
+    sessions, so by convention renderers never assign to it; nothing enforces this, and a
+    renderer needing other columns works on a copy (with copy-on-write, frames derived from
+    it do not write through).
+    """
+    columns = {}
+    for column in data.columns:
+        if column in RATING_COLUMNS:
+            columns[column], numeric = rating_categorical(data[column])
+            if column == "esg_country_star_rating":
+                columns["esg_6_or_more"] = pd.Categorical(
+                    np.where(numeric >= ESG_THRESHOLD, "ESG >= 6", "ESG < 6 or Cash"),
+                    categories=["ESG >= 6", "ESG < 6 or Cash"],
+                )
+        elif column == "weighting":
+            columns[column] = pd.to_numeric(data[column], errors="coerce").astype(float)
+        else:
+            columns[column] = data[column]
+    return pd.DataFrame(columns, index=data.index)
@@ -0,0 +1,75 @@
+"""
+Batch job that pre-renders every configured country and fund report to static artifacts.
+
+Each entity is fetched and rendered in a worker process: its HTML fragments and Plotly figure
+dicts go to <out>/<kind>/<name>.json, and a fund's holdings to <name>.arrow beside it. The
+report pages serve an artifact directly while it is younger than its table's cache TTL, so
+run this on a schedule shorter than that, e.g. hourly:
+
+    python prerender.py --out artifacts --workers 4
+    REPORT_ARTIFACTS=artifacts streamlit run xtrillion.py
+"""
+import os
+import sys
+
+# The repository's streamlit.py page shadows the streamlit package when this file is run
+# directly, as the script's directory comes first on sys.path
+_here = os.path.dirname(os.path.abspath(__file__))
+sys.path[:] = [path for path in sys.path if os.path.abspath(path or ".") != _here] + [_here]
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+from api_client import fetch_country_report
+from artifacts import ARTIFACT_DIR, save_artifact
+from report_fields import COUNTRIES, FUNDS, FUND_SUMMARY_FIELDS
+from report_utils import color_palette, country_artifact, fetch_economic_panel, fetch_fund_data, fund_artifact
+
+
+# Function to render one entity and save its artifact; runs in a worker process
+def render(job):
+    kind, name, out = job
+    started = time.monotonic()
+    try:
+        if kind == "country":
+            report = fetch_country_report(name)
+            if not report:
+                return kind, name, "no data"
+            # Fetched once per worker process and sliced for each country it renders
+            panel = fetch_economic_panel()
+            if panel is None:
+                return kind, name, "fetch failed"
+            save_artifact(kind, name, country_artifact(report, panel, color_palette), directory=out)
+        else:
+            holdings = fetch_fund_data(name, fields=FUND_SUMMARY_FIELDS)
+            if holdings is None:
+                return kind, name, "fetch failed"
+            save_artifact(kind, name, fund_artifact(holdings), frame=holdings, directory=out)
+    except requests.exceptions.RequestException as e:
+        return kind, name, f"fetch failed: {e}"
+    return kind, name, f"rendered in {time.monotonic() - started:.2f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render country and fund reports to static artifacts")
+    parser.add_argument("--out", default=ARTIFACT_DIR, help="artifact directory the pages read (REPORT_ARTIFACTS)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--countries", nargs="*", default=COUNTRIES, help="countries to render")
+    parser.add_argument("--funds", nargs="*", default=list(FUNDS.values()), help="full fund names to render")
+    args = parser.parse_args()
+
+    jobs = [("country", name, args.out) for name in args.countries]
+    jobs += [("fund", name, args.out) for name in args.funds]
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for kind, name, outcome in pool.map(render, jobs):
+            print(f"{kind} {name}: {outcome}")
+            failed += not outcome.startswith("rendered")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
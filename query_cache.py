@@ -0,0 +1,158 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Seconds a result stays fresh, per table. FullReport rows change daily at most.
+TABLE_TTLS = {
+    "FullReport": 6 * 60 * 60,
+    "fund_holdings": 60 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+# Row key columns per table, used to merge "changed since" delta responses into a cached result
+DELTA_KEYS = {
+    "FullReport": ("Country",),
+    "fund_holdings": ("fund_name", "isin"),
+}
+
+# Upper bound on the summed response size held in memory
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+# Function to turn a process_json query into a stable cache key
+def query_key(query):
+    fields = query.get("fields", "*")
+    if isinstance(fields, (list, tuple)):
+        fields = sorted(fields)
+    normalized = {
+        "db_path": query.get("db_path"),
+        "table": query.get("table"),
+        "filters": query.get("filters") or {},
+        "fields": fields,
+        "page": query.get("page", 1),
+        "page_size": query.get("page_size"),
+    }
+    return json.dumps(normalized, sort_keys=True)
+
+
+# Validator for backends that send no ETag: the hash of the response body, which a
+# backend hashing its own responses can compare against If-None-Match
+def content_hash(content):
+    return '"' + hashlib.sha256(content).hexdigest() + '"'
+
+
+class QueryCache:
+    """
+    Thread-safe TTL cache for process_json results, shared by every session in the process.
+    Entries expire after their table's TTL but are kept, with their revalidation metadata,
+    until evicted so an expired result can be revalidated instead of downloaded again. Once the
+    total size passes max_bytes the least recently used entries are evicted. Cached rows are
+    shared, so callers must not mutate them.
+    """
+
+    def __init__(self, table_ttls=None, default_ttl=DEFAULT_TTL, max_bytes=MAX_CACHE_BYTES):
+        self.table_ttls = dict(TABLE_TTLS if table_ttls is None else table_ttls)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (table, expires_at, nbytes, rows, meta)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def ttl_for(self, table):
+        return self.table_ttls.get(table, self.default_ttl)
+
+    def get(self, query):
+        key = query_key(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            return entry[3]
+
+    def get_stale(self, query):
+        """Return (rows, meta) for a query even if its entry has expired, or None."""
+        with self._lock:
+            entry = self._entries.get(query_key(query))
+            return None if entry is None else (entry[3], entry[4])
+
+    def put(self, query, rows, nbytes, ttl=None, meta=None):
+        # A single result larger than the whole budget is not worth caching
+        if nbytes > self.max_bytes:
+            return
+        key = query_key(query)
+        table = query.get("table")
+        if ttl is None:
+            ttl = self.ttl_for(table)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (table, time.monotonic() + ttl, nbytes, rows, meta or {})
+            self._size += nbytes
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, table=None, query=None):
+        """
+        Drop cached results. With no arguments everything is cleared; otherwise only the
+        given query, or every query against the given table.
+        """
+        with self._lock:
+            if query is not None:
+                key = query_key(query)
+                if key in self._entries:
+                    self._remove(key)
+                return
+            for key in [k for k, entry in self._entries.items() if table is None or entry[0] == table]:
+                self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= entry[2]
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        return self._size
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the function and
+    every caller that arrives while it is in flight waits for and shares its result or error.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self):
+        return len(self._calls)
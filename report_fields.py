@@ -0,0 +1,58 @@
+# Columns each report view reads, so queries fetch only what is rendered instead of "*"
+
+# Metric catalog: each economic series' column prefix in FullReport and its display label.
+# Series are stored as <prefix>Year1 .. <prefix>Year<ECONOMIC_YEARS>.
+ECONOMIC_METRICS = [
+    ("GDPGrowthRate", "GDP Growth (%)"),
+    ("Inflation", "Inflation Rate (%)"),
+    ("UnemploymentRate", "Unemployment Rate (%)"),
+    ("Population", "Population (millions)"),
+    ("GovernmentFinances", "Government Budget Balance (% of GDP)"),
+    ("CurrentAccountBalance", "Current Account Balance (% of GDP)"),
+]
+ECONOMIC_SERIES = [prefix for prefix, _ in ECONOMIC_METRICS]
+ECONOMIC_YEARS = 6
+# Calendar year of Year1; the labels of Year1 .. Year6 follow from it
+ECONOMIC_FIRST_YEAR = 2024
+ECONOMIC_YEAR_LABELS = list(range(ECONOMIC_FIRST_YEAR, ECONOMIC_FIRST_YEAR + ECONOMIC_YEARS))
+
+# Every economic series column, metric by metric
+ECONOMIC_FIELDS = [f"{series}Year{i}" for series in ECONOMIC_SERIES for i in range(1, ECONOMIC_YEARS + 1)]
+
+# Short country fields shown in the report header. The economic series come from the
+# panel's bulk query below, fetched once for every country.
+COUNTRY_SUMMARY_FIELDS = ["Country", "Title", "Ownership", "NFARating", "ESGRating"]
+
+# Country ratings the screener filters on, with their display labels
+COUNTRY_RATINGS = [("NFARating", "NFA Rating"), ("ESGRating", "ESG Rating")]
+
+# Columns behind the economic panel: every country's ratings and economic series
+PANEL_FIELDS = ["Country"] + [field for field, _ in COUNTRY_RATINGS] + ECONOMIC_FIELDS
+
+# Wide free-text columns, fetched separately from the summary.
+# Country is included so batched narrative queries can be split per country.
+COUNTRY_NARRATIVE_FIELDS = [
+    "Country",
+    "Overview",
+    "PoliticalNews",
+    "Strengths",
+    "Weaknesses",
+    "Opportunities",
+    "Threats",
+    "RecentNews",
+    "MoodysRating",
+    "SPGlobalRating",
+    "FitchRating",
+    "Conclusion",
+]
+
+# Columns behind the fund pie charts and the default holdings table
+FUND_SUMMARY_FIELDS = ["fund_name", "weighting", "region", "nfa_star_rating", "esg_country_star_rating"]
+
+# Entities the reports app shows, and prerender.py renders: countries by name, funds by
+# short code -> full fund name
+COUNTRIES = ["Israel", "Qatar", "Mexico", "Saudi Arabia"]
+FUNDS = {
+    "SKEWNBF": "Shin Kong Emerging Wealthy Nations Bond Fund",
+    "SKESBF": "Shin Kong Environmental Sustainability Bond Fund",
+}
@@ -1,7 +1,30 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import time
+import html
+from string import Template
 import requests
+from api_client import get_client, fetch_country_report, all_reports_query, fund_holdings_query
+from report_fields import FUND_SUMMARY_FIELDS, ECONOMIC_FIRST_YEAR, ECONOMIC_SERIES, COUNTRY_RATINGS
+from economic_panel import EconomicPanel
+from country_screener import country_screener
+from figure_cache import figure_key, get_figure_cache
+from holdings import normalize_holdings
+from filter_engine import filter_index
+from table_view import table_view
+from query_cache import QueryCache
+from artifacts import load_artifact
+
+# Rows per page of the holdings table, and rows sent past the page so a short scroll needs no rerun
+TABLE_PAGE_SIZE = 50
+TABLE_PREFETCH = 10
+
+# Holdings table columns offered as filters
+HOLDINGS_FILTERS = ["region", "nfa_star_rating", "esg_country_star_rating", "weighting"]
 
 # Custom color palette
 color_palette = [
@@ -41,117 +64,246 @@ def apply_custom_css():
         unsafe_allow_html=True
     )
 
-# Function to fetch country data from the API and create a country report tab
-def create_country_report_tab(entity_name, color_palette, db_name="credit_research.db", table_name="FullReport"):
+# Function to show when a report was rendered from last known good data after missing its deadline
+def stale_badge(deadline):
+    if deadline is not None and deadline.stale_as_of is not None:
+        as_of = time.strftime("%Y-%m-%d %H:%M", time.localtime(deadline.stale_as_of))
+        st.warning(f"The backend is slow or unavailable. Showing data as of {as_of}.")
+
+# Function to fetch country data from the API and create a country report tab.
+# compact draws the economic indicators as one grid figure instead of one chart each.
+def create_country_report_tab(entity_name, color_palette, db_name="credit_research.db", table_name="FullReport",
+                              deadline=None, compact=False):
     apply_custom_css()
     st.write(f"### {entity_name} Report")
-    url = "https://my-combined-app-vpljqiia2a-uc.a.run.app/process_json"
-    payload = {
-        "sample_key": f'{{"db_path": "{db_name}", "table": "{table_name}", "filters": {{"Country": "{entity_name}"}}, "fields": "*", "page": 1, "page_size": 10}}'
-    }
-
-    response = requests.post(url, json=payload)
-    
-    if response.status_code == 200:
-        data = response.json()
-        if data:
-            report = data[0]
-
-            col1, col2 = st.columns([6, 4])
-
-            with col1:
-                st.markdown('<div class="reportColumn">', unsafe_allow_html=True)
-                st.markdown(f'<h1 class="reportText">{report.get("Title", "Credit Research Report")}</h1>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Country Information</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText"><strong>Country:</strong> {report.get("Country", "N/A")}</p>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText"><strong>Ownership:</strong> {report.get("Ownership", "N/A")}</p>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText"><strong>NFA Rating:</strong> {report.get("NFARating", "N/A")}</p>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText"><strong>ESG Rating:</strong> {report.get("ESGRating", "N/A")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Overview</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("Overview", "No overview available.")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Politics</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("PoliticalNews", "No political news available.")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Strengths</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("Strengths", "No strengths information available.")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Weaknesses</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("Weaknesses", "No weaknesses information available.")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Opportunities</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("Opportunities", "No opportunities information available.")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Threats</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("Threats", "No threats information available.")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Recent News</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("RecentNews", "No recent news available.")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Ratings and Comments from Credit Rating Agencies</h2>', unsafe_allow_html=True)
-                st.markdown('<h3 class="reportText">Moody\'s:</h3>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("MoodysRating", "N/A")}</p>', unsafe_allow_html=True)
-                st.markdown('<h3 class="reportText">S&P Global Ratings:</h3>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("SPGlobalRating", "N/A")}</p>', unsafe_allow_html=True)
-                st.markdown('<h3 class="reportText">Fitch Ratings:</h3>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("FitchRating", "N/A")}</p>', unsafe_allow_html=True)
-                st.markdown('<h2 class="reportText">Conclusion</h2>', unsafe_allow_html=True)
-                st.markdown(f'<p class="reportText">{report.get("Conclusion", "No conclusion available.")}</p>', unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
+    report_deadline = deadline.scope() if deadline is not None else None
+    try:
+        report = fetch_country_report(entity_name, db_path=db_name, table=table_name, deadline=report_deadline)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to fetch data for {entity_name}: {e}")
+        return
+    panel = fetch_economic_panel(db_path=db_name, table=table_name, deadline=report_deadline) if report else None
+    stale_badge(report_deadline)
+
+    if report:
+        col1, col2 = st.columns([6, 4])
 
-            with col2:
-                st.markdown('<div class="chartColumn">', unsafe_allow_html=True)
-                st.header("Economic Data (2024 Onwards)")
+        with col1:
+            st.markdown(country_narrative(report), unsafe_allow_html=True)
 
-                charts_data = [
-                    ("GDP Growth (%)", [report.get(f'GDPGrowthRateYear{i}', 0) for i in range(1, 7)], color_palette[0]),
-                    ("Inflation Rate (%)", [report.get(f'InflationYear{i}', 0) for i in range(1, 7)], color_palette[1]),
-                    ("Unemployment Rate (%)", [report.get(f'UnemploymentRateYear{i}', 0) for i in range(1, 7)], color_palette[2]),
-                    ("Population (millions)", [report.get(f'PopulationYear{i}', 0) for i in range(1, 7)], color_palette[3]),
-                    ("Government Budget Balance (% of GDP)", [report.get(f'GovernmentFinancesYear{i}', 0) for i in range(1, 7)], color_palette[4]),
-                    ("Current Account Balance (% of GDP)", [report.get(f'CurrentAccountBalanceYear{i}', 0) for i in range(1, 7)], color_palette[5])
-                ]
+        with col2:
+            st.markdown('<div class="chartColumn">', unsafe_allow_html=True)
+            st.header(f"Economic Data ({ECONOMIC_FIRST_YEAR} Onwards)")
+            if panel is None:
+                st.markdown('</div>', unsafe_allow_html=True)
+                return
 
-                years = [2024, 2025, 2026, 2027, 2028, 2029]
+            charts_data = panel.charts_data(entity_name, color_palette)
+            years = panel.years
 
+            if compact:
+                st.plotly_chart(plot_indicator_grid(charts_data, years), use_container_width=True)
+            else:
                 for metric, values, color in charts_data:
                     df = pd.DataFrame({
                         "Year": years,
                         metric: values
                     })
-
                     st.plotly_chart(plot_chart(df, metric, metric, color), use_container_width=True)
-                    st.markdown(create_data_table(df, metric), unsafe_allow_html=True)
 
-                st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.error(f"No data found for {entity_name}.")
-    else:
-        st.error(f"Failed to fetch data for {entity_name}. Status code: {response.status_code}")
+            # One table for every metric, sent as a single element
+            st.markdown(create_economic_table(charts_data, years), unsafe_allow_html=True)
 
-# Function to fetch fund data from the API
-def fetch_fund_data(fund_name):
-    url = "https://my-combined-app-vpljqiia2a-uc.a.run.app/process_json"
-    payload = {
-        "sample_key": f'{{"db_path": "consolidated.db", "table": "fund_holdings", "filters": {{"fund_name": "{fund_name}"}}, "fields": "*", "page": 1, "page_size": 100}}'
-    }
-    response = requests.post(url, json=payload)
-    if response.status_code == 200:
-        data = response.json()
-        return pd.DataFrame(data)
+            st.markdown('</div>', unsafe_allow_html=True)
     else:
-        st.error(f"Failed to fetch data for {fund_name}. Status code: {response.status_code}")
+        st.error(f"No data found for {entity_name}.")
+
+# Narrative column of a country report: (field, default) pairs and the page template they fill.
+# Sections are joined without line breaks, so Markdown leaves the HTML alone.
+NARRATIVE_DEFAULTS = [
+    ("Title", "Credit Research Report"),
+    ("Country", "N/A"),
+    ("Ownership", "N/A"),
+    ("NFARating", "N/A"),
+    ("ESGRating", "N/A"),
+    ("Overview", "No overview available."),
+    ("PoliticalNews", "No political news available."),
+    ("Strengths", "No strengths information available."),
+    ("Weaknesses", "No weaknesses information available."),
+    ("Opportunities", "No opportunities information available."),
+    ("Threats", "No threats information available."),
+    ("RecentNews", "No recent news available."),
+    ("MoodysRating", "N/A"),
+    ("SPGlobalRating", "N/A"),
+    ("FitchRating", "N/A"),
+    ("Conclusion", "No conclusion available."),
+]
+NARRATIVE_TEMPLATE = Template("".join([
+    '<div class="reportColumn">',
+    '<h1 class="reportText">$Title</h1>',
+    '<h2 class="reportText">Country Information</h2>',
+    '<p class="reportText"><strong>Country:</strong> $Country</p>',
+    '<p class="reportText"><strong>Ownership:</strong> $Ownership</p>',
+    '<p class="reportText"><strong>NFA Rating:</strong> $NFARating</p>',
+    '<p class="reportText"><strong>ESG Rating:</strong> $ESGRating</p>',
+    '<h2 class="reportText">Overview</h2>',
+    '<p class="reportText">$Overview</p>',
+    '<h2 class="reportText">Politics</h2>',
+    '<p class="reportText">$PoliticalNews</p>',
+    '<h2 class="reportText">Strengths</h2>',
+    '<p class="reportText">$Strengths</p>',
+    '<h2 class="reportText">Weaknesses</h2>',
+    '<p class="reportText">$Weaknesses</p>',
+    '<h2 class="reportText">Opportunities</h2>',
+    '<p class="reportText">$Opportunities</p>',
+    '<h2 class="reportText">Threats</h2>',
+    '<p class="reportText">$Threats</p>',
+    '<h2 class="reportText">Recent News</h2>',
+    '<p class="reportText">$RecentNews</p>',
+    '<h2 class="reportText">Ratings and Comments from Credit Rating Agencies</h2>',
+    '<h3 class="reportText">Moody&#x27;s:</h3>',
+    '<p class="reportText">$MoodysRating</p>',
+    '<h3 class="reportText">S&amp;P Global Ratings:</h3>',
+    '<p class="reportText">$SPGlobalRating</p>',
+    '<h3 class="reportText">Fitch Ratings:</h3>',
+    '<p class="reportText">$FitchRating</p>',
+    '<h2 class="reportText">Conclusion</h2>',
+    '<p class="reportText">$Conclusion</p>',
+    '</div>',
+]))
+
+# Function to render the narrative column from its field values, in NARRATIVE_DEFAULTS order.
+# Each value is escaped once here, and the HTML is cached by the values' content.
+@st.cache_data(max_entries=256, show_spinner=False)
+def narrative_html(values):
+    return NARRATIVE_TEMPLATE.substitute({
+        field: html.escape(str(value)) for (field, _), value in zip(NARRATIVE_DEFAULTS, values)
+    })
+
+# Function to render a country report's narrative column as one HTML block
+def country_narrative(report):
+    return narrative_html(tuple(report.get(field, default) for field, default in NARRATIVE_DEFAULTS))
+
+# Function to render everything a country report tab shows, as HTML fragments and figure dicts,
+# slicing the country's economic series from the panel.
+# compact=None builds both the per-metric charts and the grid, as prerender.py does.
+def country_artifact(report, panel, color_palette, compact=None):
+    # Without a panel the artifact holds the narrative only and the economic column stays empty
+    if panel is None:
+        return {"narrative": country_narrative(report)}
+    charts_data = panel.charts_data(report.get("Country"), color_palette)
+    years = panel.years
+    artifact = {
+        "narrative": country_narrative(report),
+        "table": create_economic_table(charts_data, years, label_width="350px"),
+    }
+    if compact is not True:
+        artifact["charts"] = [
+            plot_indicator_chart(pd.DataFrame({"Year": years, metric: values}), metric, metric, color)
+            for metric, values, color in charts_data
+        ]
+    if compact is not False:
+        artifact["grid"] = plot_indicator_grid(charts_data, years)
+    return artifact
+
+# Function to show a country report tab from its artifact
+def show_country_artifact(artifact, compact=False):
+    col1, col2 = st.columns([6, 4])
+
+    with col1:
+        st.markdown(artifact["narrative"], unsafe_allow_html=True)
+
+    with col2:
+        st.markdown('<div class="chartColumn">', unsafe_allow_html=True)
+        st.header(f"Economic Data ({ECONOMIC_FIRST_YEAR} Onwards)")
+        if "table" not in artifact:
+            st.markdown('</div>', unsafe_allow_html=True)
+            return
+
+        # Compact mode sends one grid figure for all indicators instead of a chart per metric
+        for figure in [artifact["grid"]] if compact else artifact["charts"]:
+            st.plotly_chart(figure, use_container_width=True)
+
+        st.markdown(artifact["table"], unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+# Objects built from fetched frames, such as normalized holdings and economic panels, kept per
+# kind and query so reruns reuse one object and anything cached against it. Registered with the
+# client, so invalidating a table drops them too.
+@st.cache_resource
+def get_derived_cache(kind):
+    cache = QueryCache()
+    get_client().derived_caches.append(cache)
+    return cache
+
+# Function to fetch a query's frame and return build(frame), reusing the object built from an
+# earlier fetch. Raises requests.exceptions.RequestException if the fetch fails.
+def cached_derived(kind, query, build, nbytes, deadline=None):
+    cache = get_derived_cache(kind)
+    value = cache.get(query)
+    if value is not None:
+        return value
+
+    # The fetch gets its own scope, so it is seen as stale even when the caller's deadline
+    # was already marked by an older fallback
+    fetch_deadline = deadline.scope() if deadline is not None else None
+    value = build(get_client().fetch_frame(query, deadline=fetch_deadline))
+    # An object built from last known good data is not kept, so the next run asks the backend again
+    if fetch_deadline is None or fetch_deadline.stale_as_of is None:
+        cache.put(query, value, nbytes(value))
+    return value
+
+# Function to fetch the economic panel of every country in a table: one bulk query, built into
+# the panel once per fetch
+def fetch_economic_panel(db_path="credit_research.db", table="FullReport", deadline=None):
+    try:
+        return cached_derived("panel", all_reports_query(db_path, table), EconomicPanel.from_frame,
+                              lambda panel: panel.nbytes, deadline)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to fetch economic data: {e}")
+        return None
+
+# Function to fetch fund data from the API; fields limits the columns fetched
+def fetch_fund_data(fund_name, fields="*", deadline=None):
+    try:
+        return cached_derived("holdings", fund_holdings_query(fund_name, fields=fields), normalize_holdings,
+                              lambda holdings: int(holdings.memory_usage(deep=True).sum()), deadline)
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to fetch data for {fund_name}: {e}")
         return None
 
-def filter_dataframe(df: pd.DataFrame, identifier: str = "", filter_columns: list = None) -> pd.DataFrame:
-    if filter_columns is None:
-        filter_columns = []
+# Function to show filter widgets for filter_columns and return the matching rows.
+# With batched the widgets sit in a form, so edits apply together when the form is submitted.
+def filter_dataframe(df: pd.DataFrame, identifier: str = "", filter_columns: list = None,
+                     batched: bool = False) -> pd.DataFrame:
+    if not filter_columns:
+        return df
+
+    if batched:
+        with st.form(key=f"filters_{identifier}", border=False):
+            selections = filter_widgets(df, identifier, filter_columns)
+            st.form_submit_button("Apply filters")
+    else:
+        selections = filter_widgets(df, identifier, filter_columns)
+    return filter_index(df).apply(selections)
 
-    filtered_df = df.copy()
+# Function to create one filter widget per column and return {column: selection}
+def filter_widgets(df, identifier, filter_columns):
+    # Option lists and value ranges come from the frame's cached index
+    index = filter_index(df)
+    selections = {}
 
     for idx, col in enumerate(filter_columns):
         if col not in df.columns:
             continue
 
-        unique_values = sorted(df[col].dropna().astype(str).unique())
-
-        if pd.api.types.is_numeric_dtype(df[col]):
-            numeric_values = df[col].dropna()
-            default_value = [float(numeric_values.min()), float(numeric_values.max())]
-            selected_values = st.slider(
+        if index.is_numeric(col):
+            bounds = index.bounds(col)
+            # A slider needs a range to select from
+            if bounds is None or bounds[0] == bounds[1]:
+                continue
+            default_value = list(bounds)
+            selections[col] = st.slider(
                 f"Filter {col} ({identifier})",
                 min_value=default_value[0],
                 max_value=default_value[1],
@@ -159,114 +311,287 @@ def filter_dataframe(df: pd.DataFrame, identifier: str = "", filter_columns: lis
                 step=(default_value[1] - default_value[0]) / 100,
                 key=f"filter_{col}_{identifier}_{idx}"
             )
-            filtered_df = filtered_df[
-                (filtered_df[col] >= selected_values[0]) &
-                (filtered_df[col] <= selected_values[1])
-            ]
         else:
-            selected_values = st.multiselect(
+            unique_values = index.options(col)
+            selections[col] = st.multiselect(
                 f"Filter {col} ({identifier})",
                 options=unique_values,
                 default=unique_values,
                 key=f"filter_{col}_{identifier}_{idx}"
             )
-            filtered_df = filtered_df[filtered_df[col].astype(str).isin(selected_values)]
 
-    return filtered_df
+    return selections
 
 
-# Function to create pie charts and filter the data table
-def create_pie_charts_and_table(fund_data):
-    if fund_data is not None:
-        # Add "Cash" for missing NFA ratings and create the NFA pie chart
-        fund_data['nfa_star_rating'] = fund_data['nfa_star_rating'].fillna('Cash')
-        fig_nfa = px.pie(fund_data, names='nfa_star_rating', values='weighting', title="NFA Star Rating Distribution",
-                         color_discrete_sequence=color_palette, hole=0.4)
-        fig_nfa.update_traces(textinfo='percent+label')
-        fig_nfa.update_layout(paper_bgcolor='#1f1f1f', plot_bgcolor='#1f1f1f', font=dict(color='white'), height=500, width=500, 
-                              transition_duration=500)
-
-        # Add "Cash" for missing ESG ratings and create the ESG pie chart
-        fund_data['esg_country_star_rating'] = fund_data['esg_country_star_rating'].fillna('Cash')
-        fig_esg = px.pie(fund_data, names='esg_country_star_rating', values='weighting', title="ESG Country Star Rating Distribution",
-                         color_discrete_sequence=color_palette, hole=0.4)
-        fig_esg.update_traces(textinfo='percent+label')
-        fig_esg.update_layout(paper_bgcolor='#1f1f1f', plot_bgcolor='#1f1f1f', font=dict(color='white'), height=500, width=500, 
-                              transition_duration=500)
-
-        # Create a chart for ESG ratings with a rating of 6 or more
-        fund_data['esg_6_or_more'] = fund_data['esg_country_star_rating'].apply(
-            lambda x: 'ESG >= 6' if isinstance(x, (int, float)) and x >= 6 else 'ESG < 6 or Cash'
-        )
-        fig_esg_6 = px.pie(fund_data, names='esg_6_or_more', values='weighting', title="ESG Ratings 6 or More",
-                           color_discrete_sequence=color_palette, hole=0.4)
-        fig_esg_6.update_traces(textinfo='percent+label')
-        fig_esg_6.update_layout(paper_bgcolor='#1f1f1f', plot_bgcolor='#1f1f1f', font=dict(color='white'), height=500, width=500, 
-                                transition_duration=500)
-
-        # Create a Region pie chart
-        fig_region = px.pie(fund_data, names='region', values='weighting', title="Region Distribution",
-                            color_discrete_sequence=color_palette, hole=0.4)
-        fig_region.update_traces(textinfo='percent+label')
-        fig_region.update_layout(paper_bgcolor='#1f1f1f', plot_bgcolor='#1f1f1f', font=dict(color='white'), height=500, width=500, 
-                                 transition_duration=500)
-
-        # Create two rows for the charts
-        col1, col2 = st.columns([1, 1])
-        with col1:
-            st.plotly_chart(fig_region, use_container_width=True)
-        with col2:
-            st.plotly_chart(fig_nfa, use_container_width=True)
+# Function to total a fund's weighting by region, NFA rating, ESG rating and the ESG >= 6 split.
+# The holdings are grouped once on all four columns; each breakdown is then summed from those
+# few combined totals, so the charts carry one value per category rather than one per holding.
+def fund_breakdowns(fund_data):
+    keys = ['region', 'nfa_star_rating', 'esg_country_star_rating', 'esg_6_or_more']
+    # sort=False keeps first-appearance order, which fixes the slice colours
+    combined = fund_data.groupby(keys, sort=False, dropna=False, observed=True)['weighting'].sum()
+    return {
+        key: combined.groupby(level=key, sort=False, observed=True).sum()
+        for key in keys
+    }
+
+# Function to create a pie chart from category totals, memoized like plot_chart
+def pie_chart(totals, title):
+    def build():
+        fig = px.pie(names=totals.index, values=totals.values, title=title,
+                     color_discrete_sequence=color_palette, hole=0.4)
+        fig.update_traces(textinfo='percent+label')
+        fig.update_layout(paper_bgcolor='#1f1f1f', plot_bgcolor='#1f1f1f', font=dict(color='white'), height=500, width=500, 
+                          transition_duration=500)
+        return fig
+
+    key = figure_key("pie", totals.reset_index(), title, color_palette, "#1f1f1f")
+    return get_figure_cache().get_or_build(key, build)
+
+# Function to show a frame as a sorted, paginated table. Sorting and slicing happen here, and
+# only the current page plus TABLE_PREFETCH rows, scrollable below it, are sent to the browser.
+def create_holdings_table(data, key):
+    view = table_view(data)
+    pages = max(1, -(-view.rows // TABLE_PAGE_SIZE))
+    # A narrower filter can leave the remembered page past the end
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+
+    col1, col2, col3 = st.columns([3, 2, 2])
+    with col1:
+        sort_by = st.selectbox("Sort by", [None] + view.columns, key=f"{key}_sort",
+                               format_func=lambda column: "(unsorted)" if column is None else column)
+    with col2:
+        descending = st.toggle("Descending", key=f"{key}_descending")
+    with col3:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    start = (page - 1) * TABLE_PAGE_SIZE
+    window = view.window(start, start + TABLE_PAGE_SIZE + TABLE_PREFETCH, sort_by, descending)
+    st.dataframe(window, use_container_width=True, hide_index=True,
+                 height=min(TABLE_PAGE_SIZE, window.num_rows) * 35 + 38)
+    st.caption(f"Rows {min(start + 1, view.rows)}-{min(start + TABLE_PAGE_SIZE, view.rows)} of {view.rows}")
+
+# Function to render a fund report's pie charts as figure dicts
+def fund_artifact(fund_data):
+    breakdowns = fund_breakdowns(fund_data)
+    return {
+        "figures": {
+            "region": pie_chart(breakdowns['region'], "Region Distribution"),
+            "nfa": pie_chart(breakdowns['nfa_star_rating'], "NFA Star Rating Distribution"),
+            "esg": pie_chart(breakdowns['esg_country_star_rating'], "ESG Country Star Rating Distribution"),
+            "esg_6": pie_chart(breakdowns['esg_6_or_more'], "ESG Ratings 6 or More"),
+        }
+    }
 
-        col3, col4 = st.columns([1, 1])
-        with col3:
-            st.plotly_chart(fig_esg, use_container_width=True)
-        with col4:
-            st.plotly_chart(fig_esg_6, use_container_width=True)
+# Function to show a fund's pie charts from its artifact, followed by the holdings table
+def show_fund_artifact(artifact, fund_data, fund_name=None):
+    figures = artifact["figures"]
 
-        # Apply the filters to the table data
-        filtered_data = filter_dataframe(fund_data)
+    # Create two rows for the charts
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.plotly_chart(figures["region"], use_container_width=True)
+    with col2:
+        st.plotly_chart(figures["nfa"], use_container_width=True)
 
-        # Display the filtered DataFrame
-        st.write(filtered_data)
+    col3, col4 = st.columns([1, 1])
+    with col3:
+        st.plotly_chart(figures["esg"], use_container_width=True)
+    with col4:
+        st.plotly_chart(figures["esg_6"], use_container_width=True)
+
+    holdings_table(fund_data, fund_name)
+
+# Function to create pie charts and filter the data table
+def create_pie_charts_and_table(fund_data, fund_name=None):
+    if fund_data is not None:
+        show_fund_artifact(fund_artifact(fund_data), fund_data, fund_name)
+
+# Function to create the filtered holdings table. It reruns as a fragment, so sorting, paging
+# and filtering recompute only the table, never the charts above it or the fund's fetch.
+@st.fragment
+def holdings_table(fund_data, fund_name=None):
+    # The charts only need the summary columns; the remaining holding columns are
+    # fetched when the user asks for them
+    table_data = fund_data
+    if fund_name is not None and st.toggle("Show all holding columns", key=f"all_columns_{fund_name}"):
+        table_data = fetch_fund_data(fund_name)
+        if table_data is None:
+            return
+
+    # Apply the filters to the table data
+    filtered_data = filter_dataframe(table_data, identifier=fund_name or "holdings",
+                                     filter_columns=HOLDINGS_FILTERS, batched=True)
+
+    # Display the filtered DataFrame a page at a time
+    create_holdings_table(filtered_data, key=f"holdings_{fund_name}")
 
 # Function to create the fund report tab
-def create_fund_report_tab(fund_name, color_palette):
+def create_fund_report_tab(fund_name, color_palette, deadline=None):
     apply_custom_css()
     st.write(f"### {fund_name} Fund Report")
-    fund_data = fetch_fund_data(fund_name)
-    
+
+    # A fresh pre-rendered artifact is served as is, with no fetch or chart building
+    loaded = load_artifact("fund", fund_name)
+    if loaded is not None and loaded[1] is not None:
+        show_fund_artifact(loaded[0], loaded[1], fund_name)
+        return
+
+    report_deadline = deadline.scope() if deadline is not None else None
+    fund_data = fetch_fund_data(fund_name, fields=FUND_SUMMARY_FIELDS, deadline=report_deadline)
+    stale_badge(report_deadline)
+
     if fund_data is not None:
-        create_pie_charts_and_table(fund_data)
+        create_pie_charts_and_table(fund_data, fund_name)
     else:
         st.error(f"No data found for {fund_name}.")
 
+# Function to create the cross-country screener tab. Every country comes from the economic panel's
+# bulk fetch, and the ranking below it is screened in memory.
+def create_screener_tab(deadline=None):
+    apply_custom_css()
+    st.write("### Country Screener")
+    report_deadline = deadline.scope() if deadline is not None else None
+    panel = fetch_economic_panel(deadline=report_deadline)
+    stale_badge(report_deadline)
+
+    if panel is None:
+        return
+    if not len(panel):
+        st.error("No country reports found.")
+        return
+    screener_table(panel)
+
+# Function to rank the countries by the chosen indicator, year and rating floors. It reruns as a
+# fragment and the criteria apply together, so a change screens the cached panel, never refetches.
+@st.fragment
+def screener_table(panel):
+    screener = country_screener(panel)
+    with st.form(key="screener", border=False):
+        col1, col2, col3, col4 = st.columns(4)
+        metric = col1.selectbox("Indicator", ECONOMIC_SERIES, format_func=panel.metric_label,
+                                key="screener_metric")
+        year = col2.selectbox("Year", panel.years, key="screener_year")
+        min_value = col3.number_input("Minimum value", value=None, key="screener_min")
+        max_value = col4.number_input("Maximum value", value=None, key="screener_max")
+
+        columns = st.columns(len(COUNTRY_RATINGS) + 1)
+        floors = [
+            column.number_input(f"Minimum {label}", min_value=0, value=None, key=f"screener_{field}")
+            for column, (field, label) in zip(columns, COUNTRY_RATINGS)
+        ]
+        lowest_first = columns[-1].toggle("Lowest first", key="screener_lowest_first")
+        st.form_submit_button("Screen")
+
+    min_ratings = tuple((field, floor) for (field, _), floor in zip(COUNTRY_RATINGS, floors) if floor is not None)
+    result = screener.screen(metric, year, min_value, max_value, min_ratings, descending=not lowest_first)
+    st.dataframe(result, hide_index=True, use_container_width=True)
+    st.caption(f"{len(result)} of {len(screener)} countries")
+
 # Function to plot charts (for both country and fund reports)
+# Figures are memoized by the chart's data and spec, so a repeat render skips Plotly Express
 def plot_chart(df, y_column, title, color):
-    fig = px.bar(df, x='Year', y=y_column,
-                 title=title,
-                 color_discrete_sequence=[color],
-                 height=375)
-    fig.update_layout(
-        plot_bgcolor='#1f1f1f', 
-        paper_bgcolor='#1f1f1f',
-        font=dict(color='white'),
-        margin=dict(l=20, r=20, t=60, b=40)
-    )
-    return fig
-
-# Function to create data tables
-def create_data_table(df, y_column):
-    table_html = "<table class='data-table'>"
-    table_html += "<tr><th style='width: 80px;'>Year</th>" + "".join([f"<th>{year}</th>" for year in df['Year']]) + "</tr>"
-    table_html += f"<tr><td>{y_column}</td>"
-    for value in df[y_column]:
-        if value is not None:
-            table_html += f"<td>{value:.2f}</td>"  # Format as a float with 2 decimal places
-        else:
-            table_html += "<td>N/A</td>"  # Use "N/A" for None values
-    table_html += "</tr></table>"
-    return table_html
+    def build():
+        fig = px.bar(df, x='Year', y=y_column,
+                     title=title,
+                     color_discrete_sequence=[color],
+                     height=375)
+        fig.update_layout(
+            plot_bgcolor='#1f1f1f', 
+            paper_bgcolor='#1f1f1f',
+            font=dict(color='white'),
+            margin=dict(l=20, r=20, t=60, b=40)
+        )
+        return fig
+
+    key = figure_key("bar", df[['Year', y_column]], title, color, "#1f1f1f", None)
+    return get_figure_cache().get_or_build(key, build)
+
+# Function to plot one economic indicator on the country report tabs: plot_chart's bars with
+# a y-axis padded around the data
+def plot_indicator_chart(df, y_column, title, color, bg_color='#1f1f1f'):
+    y_range = y_axis_range(df[y_column])
+
+    def build():
+        fig = px.bar(df, x='Year', y=y_column,
+                     title=title,
+                     color_discrete_sequence=[color],
+                     height=375)
+        fig.update_traces(marker_line_width=0)
+        fig.update_layout(
+            yaxis=dict(range=y_range),
+            plot_bgcolor=bg_color,
+            paper_bgcolor=bg_color,
+            font=dict(color='white'),
+            margin=dict(l=20, r=20, t=60, b=40),
+            autosize=True
+        )
+        return fig
+
+    # The chart kind keeps these figures apart from plot_chart's when y_range is None
+    key = figure_key("indicator", df[['Year', y_column]], title, color, bg_color, y_range)
+    return get_figure_cache().get_or_build(key, build)
+
+# Function to compute a bar chart's y-axis range: 5% past the data, or +/-1 around a flat series
+def y_axis_range(values):
+    values = pd.Series(values, dtype=float)
+    y_min = values.min()
+    y_max = values.max()
+    if pd.isna(y_min):
+        return None
+    if y_min == y_max:
+        return [y_min - 1, y_max + 1]
+    return [y_min - 0.05 * abs(y_min), y_max + 0.05 * abs(y_max)]
+
+# Function to plot every economic indicator in one figure, one panel per metric.
+# Compact mode sends this single figure instead of one chart per metric.
+def plot_indicator_grid(charts_data, years, bg_color='#1f1f1f', columns=2):
+    rows = -(-len(charts_data) // columns)
+    frame = pd.DataFrame({metric: pd.Series(values, dtype=float) for metric, values, _ in charts_data})
+    colors = [color for _, _, color in charts_data]
+
+    def build():
+        fig = make_subplots(rows=rows, cols=columns, subplot_titles=list(frame.columns),
+                            vertical_spacing=0.3 / rows, horizontal_spacing=0.12)
+        for index, (metric, color) in enumerate(zip(frame.columns, colors)):
+            row, col = index // columns + 1, index % columns + 1
+            fig.add_trace(go.Bar(x=years, y=frame[metric], name=metric, marker_color=color,
+                                 marker_line_width=0, showlegend=False), row=row, col=col)
+            fig.update_yaxes(range=y_axis_range(frame[metric]), row=row, col=col)
+        fig.update_xaxes(type='category')
+        fig.update_layout(
+            height=300 * rows,
+            plot_bgcolor=bg_color,
+            paper_bgcolor=bg_color,
+            font=dict(color='white'),
+            margin=dict(l=20, r=20, t=60, b=40),
+            autosize=True
+        )
+        return fig
+
+    key = figure_key("grid", frame, list(years), colors, bg_color, columns)
+    return get_figure_cache().get_or_build(key, build)
+
+# Function to render the HTML table of a country's economic data: one row per metric, one column per year.
+# Cells are formatted column-wise in one pass, and the HTML is cached by content.
+@st.cache_data(max_entries=256, show_spinner=False)
+def economic_table_html(metrics, years, values, label_width="80px"):
+    values = pd.DataFrame(list(values)).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    cells = np.where(np.isnan(values), "N/A", np.char.mod("%.2f", values))  # "N/A" for missing values
+
+    header = f"<tr><th style='width:{label_width};'>Year</th><th>" + "</th><th>".join(map(str, years)) + "</th></tr>"
+    rows = [
+        f"<tr><td style='width:{label_width};'>{metric}</td><td>" + "</td><td>".join(row) + "</td></tr>"
+        for metric, row in zip(metrics, cells)
+    ]
+    return "<table class='data-table'>" + header + "".join(rows) + "</table>"
+
+# Function to create the economic data table for the (metric, values, color) entries of a report
+def create_economic_table(charts_data, years, label_width="80px"):
+    metrics = tuple(metric for metric, _, _ in charts_data)
+    values = tuple(tuple(values) for _, values, _ in charts_data)
+    return economic_table_html(metrics, tuple(years), values, label_width)
 
 # The code is now organized into separate functions, and duplications have been removed.
 # You can call create_country_report_tab() or create_fund_report_tab() in your main app to generate the reports.
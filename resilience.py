@@ -0,0 +1,81 @@
+import threading
+import time
+
+import requests
+
+# Latency budget for one page run, in seconds
+PAGE_BUDGET = 4.0
+
+# Consecutive backend failures that open the circuit, and how long it stays open
+BREAKER_FAILURES = 5
+BREAKER_COOLDOWN = 30.0
+
+
+class BackendUnavailable(requests.exceptions.ConnectionError):
+    """The circuit breaker is open, so the backend was not called."""
+
+
+class Deadline:
+    """
+    Latency budget shared by the fetches of one page run. A fetch made under a deadline stops
+    waiting once it passes and falls back to the last known good result; stale_as_of then holds
+    the wall-clock time of the oldest such fallback. A fetch with nothing to fall back to waits. scope() gives a child that shares the
+    expiry but tracks staleness separately, e.g. per report, and reports it to its parent.
+    """
+
+    def __init__(self, seconds=PAGE_BUDGET, parent=None):
+        self.expires_at = parent.expires_at if parent is not None else time.monotonic() + seconds
+        self.parent = parent
+        self.stale_as_of = None
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def scope(self):
+        return Deadline(parent=self)
+
+    def mark_stale(self, fetched_at):
+        if self.stale_as_of is None or fetched_at < self.stale_as_of:
+            self.stale_as_of = fetched_at
+        if self.parent is not None:
+            self.parent.mark_stale(fetched_at)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a backend that keeps failing. After failure_threshold consecutive failures
+    the circuit opens and calls are refused for cooldown seconds; then a single trial call is
+    let through, and its outcome closes the circuit or opens it again.
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown:
+                # Half-open: restart the cooldown so only this caller makes the trial call
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
@@ -0,0 +1,70 @@
+import json
+import sqlite3
+import threading
+import time
+
+from query_cache import query_key
+
+
+class SnapshotStore:
+    """
+    SQLite file holding the last good result of every process_json query.
+    Lets a fresh process render from disk before the backend answers, or when it is down.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " key TEXT PRIMARY KEY,"
+                " query TEXT NOT NULL,"
+                " rows TEXT NOT NULL,"
+                " saved_at REAL NOT NULL,"
+                " meta TEXT NOT NULL DEFAULT '{}')"
+            )
+            # Stores created before revalidation metadata was kept lack the meta column
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(snapshots)")]
+            if "meta" not in columns:
+                self._conn.execute("ALTER TABLE snapshots ADD COLUMN meta TEXT NOT NULL DEFAULT '{}'")
+
+    def save(self, query, rows, meta=None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (key, query, rows, saved_at, meta) VALUES (?, ?, ?, ?, ?)",
+                (query_key(query), json.dumps(query), json.dumps(rows), time.time(), json.dumps(meta or {})),
+            )
+
+    def load(self, query):
+        """Return (rows, saved_at, meta) for a query, or None if it was never saved."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rows, saved_at, meta FROM snapshots WHERE key = ?", (query_key(query),)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], json.loads(row[2])
+
+    def load_all(self):
+        """Return a list of (query, rows, nbytes, saved_at, meta) for every saved query."""
+        with self._lock:
+            saved = self._conn.execute("SELECT query, rows, saved_at, meta FROM snapshots").fetchall()
+        return [
+            (json.loads(query), json.loads(rows), len(rows), saved_at, json.loads(meta))
+            for query, rows, saved_at, meta in saved
+        ]
+
+    def delete(self, table=None, query=None):
+        """
+        Drop saved results. With no arguments everything is deleted; otherwise only the
+        given query, or every query against the given table.
+        """
+        with self._lock, self._conn:
+            if query is not None:
+                self._conn.execute("DELETE FROM snapshots WHERE key = ?", (query_key(query),))
+            elif table is not None:
+                self._conn.execute("DELETE FROM snapshots WHERE json_extract(query, '$.table') = ?", (table,))
+            else:
+                self._conn.execute("DELETE FROM snapshots")
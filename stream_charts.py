@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import requests
+from api_client import get_client, fund_holdings_query
 
 st.set_page_config(layout="wide")
 
@@ -17,17 +18,12 @@ color_palette = [
 
 # Function to fetch fund data from the API
 def fetch_fund_data(fund_name):
-    url = "https://my-combined-app-vpljqiia2a-uc.a.run.app/process_json"
-    payload = {
-        "sample_key": f'{{"db_path": "consolidated.db", "table": "fund_holdings", "filters": {{"fund_name": "{fund_name}"}}, "fields": "*", "page": 1, "page_size": 100}}'
-    }
-    response = requests.post(url, json=payload)
-    if response.status_code == 200:
-        data = response.json()
-        return pd.DataFrame(data)
-    else:
-        st.error(f"Failed to fetch data for {fund_name}. Status code: {response.status_code}")
+    try:
+        data = get_client().fetch_all(fund_holdings_query(fund_name))
+    except requests.exceptions.RequestException as e:
+        st.error(f"Failed to fetch data for {fund_name}: {e}")
         return None
+    return pd.DataFrame(data)
 
 # Function to create pie charts and filter the data table
 def create_pie_charts_and_table(fund_data):
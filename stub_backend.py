@@ -0,0 +1,264 @@
+"""
+Local stand-in for the process_json backend, for development and benchmarks.
+
+Queries are answered from SQLite fixtures: the query's db_path names a file in the fixtures
+directory (e.g. fixtures/credit_research.db), so copies of the backend databases work as-is.
+In record mode every query is forwarded to the real endpoint and its response saved to
+fixtures/recordings.db; recorded responses are replayed before the fixture tables are consulted.
+Successful responses carry a content-hash ETag and a matching If-None-Match gets an empty 304.
+Fixture results of tables with row keys also carry X-Data-Version; a query sending a recent
+version as "since" gets only the rows changed since then, flagged with X-Delta.
+Requests that accept application/vnd.apache.arrow.stream are answered as Arrow IPC streams.
+
+Point the app at it with PROCESS_JSON_URL:
+
+    python stub_backend.py --fixtures fixtures --latency 0.2 --error-rate 0.05
+    PROCESS_JSON_URL=http://127.0.0.1:8502/process_json streamlit run xtrillion.py
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+try:
+    import pyarrow as pa
+except ImportError:  # JSON only
+    pa = None
+
+from query_cache import DELTA_KEYS, content_hash, query_key
+
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Earlier results kept per query, so a "since" that old can still be answered with a delta
+VERSIONS_KEPT = 4
+
+
+class QueryError(ValueError):
+    pass
+
+
+# Function to check a table or column name before it is placed in SQL
+def identifier(name):
+    if not isinstance(name, str) or not IDENTIFIER.match(name):
+        raise QueryError(f"Invalid identifier: {name!r}")
+    return f'"{name}"'
+
+
+# Function to translate a process_json query into SQL and its parameters
+def build_sql(query):
+    fields = query.get("fields", "*")
+    if fields == "*":
+        columns = "*"
+    else:
+        columns = ", ".join(identifier(field.strip()) for field in fields.split(","))
+
+    conditions = []
+    params = []
+    for column, value in (query.get("filters") or {}).items():
+        if isinstance(value, list):
+            conditions.append(f"{identifier(column)} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            conditions.append(f"{identifier(column)} = ?")
+            params.append(value)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    page = int(query.get("page", 1))
+    page_size = int(query.get("page_size", 10))
+    sql = f"SELECT {columns} FROM {identifier(query['table'])}{where} LIMIT ? OFFSET ?"
+    return sql, params + [page_size, (page - 1) * page_size]
+
+
+# Function to list the rows of new that differ from old by key, plus a _deleted marker for
+# each key that is gone; the client merges these with api_client.merge_delta
+def row_delta(old, new, keys):
+    old_rows = {tuple(row.get(key) for key in keys): row for row in old}
+    new_keys = set()
+    changes = []
+    for row in new:
+        row_key = tuple(row.get(key) for key in keys)
+        new_keys.add(row_key)
+        if old_rows.get(row_key) != row:
+            changes.append(row)
+    changes += [dict(zip(keys, row_key), _deleted=True) for row_key in old_rows if row_key not in new_keys]
+    return changes
+
+
+class StubBackend:
+    def __init__(self, fixtures, record_url=None, latency=0.0, jitter=0.0, error_rate=0.0):
+        self.fixtures = fixtures
+        self.record_url = record_url
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.session = requests.Session()
+        self.versions = {}  # query key -> OrderedDict of data version -> rows
+        self._lock = threading.Lock()
+        os.makedirs(fixtures, exist_ok=True)
+        self.recordings = sqlite3.connect(os.path.join(fixtures, "recordings.db"), check_same_thread=False)
+        with self.recordings:
+            self.recordings.execute(
+                "CREATE TABLE IF NOT EXISTS recordings (key TEXT PRIMARY KEY, status INTEGER, body TEXT)"
+            )
+
+    def handle(self, sample_key):
+        """Return (status, body, headers) for a process_json request body's sample_key."""
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and random.random() < self.error_rate:
+            return 503, json.dumps({"error": "Injected failure"}), {}
+
+        try:
+            query = json.loads(sample_key)
+            if self.record_url:
+                return self.record(query) + ({},)
+            recorded = self.replay(query)
+            if recorded is not None:
+                return recorded + ({},)
+            return self.answer(query)
+        except (QueryError, KeyError, TypeError, ValueError, sqlite3.Error) as e:
+            return 400, json.dumps({"error": str(e)}), {}
+
+    def answer(self, query):
+        """
+        Answer a query from the fixtures. For tables in DELTA_KEYS the result's content hash is
+        sent as X-Data-Version, and a "since" naming a recent version gets just the changed
+        rows. A delta keeps the full result's ETag, so an unchanged result still gets a 304.
+        """
+        rows = self.run_query(query)
+        body = json.dumps(rows)
+        keys = DELTA_KEYS.get(query.get("table"))
+        if keys is None:
+            return 200, body, {}
+
+        etag = content_hash(body.encode("utf-8"))
+        version = etag.strip('"')
+        with self._lock:
+            # query_key ignores "since", so every version of a query shares one history
+            versions = self.versions.setdefault(query_key(query), OrderedDict())
+            previous = versions.get(query.get("since"))
+            versions[version] = rows
+            versions.move_to_end(version)
+            while len(versions) > VERSIONS_KEPT:
+                versions.popitem(last=False)
+
+        headers = {"X-Data-Version": version}
+        if previous is None:
+            return 200, body, headers
+        return 200, json.dumps(row_delta(previous, rows, keys)), dict(headers, **{"X-Delta": "1", "ETag": etag})
+
+    def run_query(self, query):
+        db_file = os.path.join(self.fixtures, os.path.basename(query["db_path"]))
+        if not os.path.exists(db_file):
+            raise QueryError(f"No fixture database {query['db_path']}")
+        sql, params = build_sql(query)
+        conn = sqlite3.connect(db_file)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def record(self, query):
+        response = self.session.post(self.record_url, json={"sample_key": json.dumps(query)}, timeout=60)
+        with self._lock, self.recordings:
+            self.recordings.execute(
+                "INSERT OR REPLACE INTO recordings (key, status, body) VALUES (?, ?, ?)",
+                (query_key(query), response.status_code, response.text),
+            )
+        return response.status_code, response.text
+
+    def replay(self, query):
+        with self._lock:
+            row = self.recordings.execute(
+                "SELECT status, body FROM recordings WHERE key = ?", (query_key(query),)
+            ).fetchone()
+        return tuple(row) if row else None
+
+
+# Function to encode JSON rows as an Arrow IPC stream
+def arrow_stream(rows):
+    table = pa.Table.from_pylist(rows)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# Function to build the HTTP handler class bound to a backend
+def make_handler(backend):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/process_json":
+                return self.reply(404, json.dumps({"error": "Not found"}))
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                sample_key = body["sample_key"]
+            except (ValueError, KeyError, TypeError):
+                return self.reply(400, json.dumps({"error": "Expected a JSON body with sample_key"}))
+            status, body, headers = backend.handle(sample_key)
+            if status != 200:
+                return self.reply(status, body)
+
+            data = body.encode("utf-8")
+            content_type = "application/json"
+            # Deltas are merged as rows, so only full results are sent as Arrow
+            if pa is not None and ARROW_STREAM in self.headers.get("Accept", "") and "X-Delta" not in headers:
+                data = arrow_stream(json.loads(body))
+                content_type = ARROW_STREAM
+            etag = headers.pop("ETag", None) or content_hash(data)
+            if etag == self.headers.get("If-None-Match"):
+                return self.reply(304, b"", etag, headers=headers)
+            self.reply(200, data, etag, content_type, headers)
+
+        def reply(self, status, body, etag=None, content_type="application/json", headers=None):
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if status != 304:
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the process_json backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--fixtures", default="fixtures", help="directory of SQLite fixture databases")
+    parser.add_argument("--record", metavar="URL", help="forward queries to URL and save the responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    backend = StubBackend(args.fixtures, args.record, args.latency, args.jitter, args.error_rate)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(backend))
+    print(f"process_json stand-in listening on http://{args.host}:{args.port}/process_json")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
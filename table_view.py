@@ -0,0 +1,50 @@
+import threading
+import weakref
+
+import pyarrow as pa
+
+from frame_cache import FrameCache
+
+
+class TableView:
+    """
+    Arrow copy of a frame for paged display. The frame is converted once and each page is a
+    take() of the visible rows, so a rerun ships only the window shown whatever the frame's size.
+    Sort orders are computed on first use and kept per column and direction.
+    """
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.rows = len(df)
+        self.table = pa.Table.from_pandas(df, preserve_index=False)
+        self._df = weakref.ref(df)
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def order(self, column, descending=False):
+        """Row positions sorted by a column, missing values last."""
+        key = (column, descending)
+        with self._lock:
+            order = self._orders.get(key)
+        if order is None:
+            # Categoricals sort in category order, e.g. ratings ascending and then Cash
+            values = self._df()[column].reset_index(drop=True)
+            order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def window(self, start, stop, sort_by=None, descending=False):
+        """Return rows start:stop, after sorting by sort_by if given, as an Arrow table."""
+        if sort_by is None:
+            return self.table.slice(start, max(0, stop - start))
+        return self.table.take(pa.array(self.order(sort_by, descending)[start:stop], type=pa.int64()))
+
+
+_views = FrameCache(TableView)
+
+
+# Function to get the TableView of a frame, converting it on first use. Views are held only as
+# long as their frame, so the frame must not be mutated once it is shown.
+def table_view(df):
+    return _views.get(df)
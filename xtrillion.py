@@ -3,8 +3,12 @@ st.set_page_config(layout="wide")
 import pandas as pd
 import plotly.express as px
 import requests
+from api_client import warm_reports
+from resilience import Deadline
 from credit_reports import create_country_report_tab
-from report_utils import create_fund_report_tab
+from report_utils import create_fund_report_tab, create_screener_tab
+from report_fields import COUNTRIES, FUNDS
+from artifacts import load_artifact
 
 # Custom CSS for background and text colors (matching credit_reports.py)
 st.markdown(
@@ -68,25 +72,65 @@ color_palette = [
     "#DA70D6"   # Vivid Purple
 ]
 
-# Define tabs for countries and funds
-tabs = st.tabs(["Israel", "Qatar", "Mexico", "Saudi Arabia", "SKEWNBF", "SKESBF"])
+# Entities shown as tabs: countries by name, funds by short code -> full fund name
+countries = COUNTRIES
+funds = FUNDS
 
-# Country reports
-with tabs[0]:
-    create_country_report_tab("Israel", color_palette)
+# Extra tab ranking every country in FullReport side by side
+screener = "Screener"
 
-with tabs[1]:
-    create_country_report_tab("Qatar", color_palette)
+# Lazy mode renders only the selected entity; set to False to build every tab on each rerun
+lazy_tabs = True
 
-with tabs[2]:
-    create_country_report_tab("Mexico", color_palette)
+# Compact mode draws a country's six economic indicators as one grid figure instead of six charts
+compact_charts = False
 
-with tabs[3]:
-    create_country_report_tab("Saudi Arabia", color_palette)
 
-# Fund reports
-with tabs[4]:
-    create_fund_report_tab("Shin Kong Emerging Wealthy Nations Bond Fund", color_palette)
+# Every fetch on this run shares one latency budget; reports that miss it render from
+# their last known good data instead of blocking the page
+deadline = Deadline()
 
-with tabs[5]:
-    create_fund_report_tab("Shin Kong Environmental Sustainability Bond Fund", color_palette)
+
+# Function to load several entities' data with one batched query per table
+# Entities with a fresh pre-rendered artifact are served from it and need no fetch
+def warm_entities(selected):
+    warm_reports(
+        countries=[entity for entity in selected
+                   if entity in countries and load_artifact("country", entity) is None],
+        fund_names=[funds[entity] for entity in selected
+                    if entity in funds and load_artifact("fund", funds[entity]) is None],
+        deadline=deadline,
+    )
+
+
+# Function to render one entity's report
+def render_entity(entity):
+    if entity == screener:
+        create_screener_tab(deadline)
+    elif entity in funds:
+        create_fund_report_tab(funds[entity], color_palette, deadline)
+    else:
+        create_country_report_tab(entity, color_palette, deadline, compact=compact_charts)
+
+
+entities = countries + list(funds) + [screener]
+
+if lazy_tabs:
+    selected_entity = st.radio("Report", entities, horizontal=True, key="selected_entity",
+                               label_visibility="collapsed")
+
+    # Entities opened earlier in this session are refreshed alongside the selected one,
+    # so switching back to them is served from the cache
+    visited = st.session_state.setdefault("visited_entities", [])
+    if selected_entity not in visited:
+        visited.append(selected_entity)
+    warm_entities(visited)
+
+    render_entity(selected_entity)
+else:
+    # Fetch every tab's data up front in batched queries; the tabs below then render from the cache
+    warm_entities(entities)
+
+    for tab, entity in zip(st.tabs(entities), entities):
+        with tab:
+            render_entity(entity)